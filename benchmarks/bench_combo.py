@@ -0,0 +1,233 @@
+"""
+Offscreen stroke-replay benchmarks for the combo widget.
+
+Builds a ComboTool against a stub engine and replays scripted stroke
+streams in real time, timing both the engine-side hand-off and the
+GUI-side drain of each stroke, then writes the measurements as JSON:
+
+    python benchmarks/bench_combo.py --output bench_results.json
+    python benchmarks/bench_combo.py --scenario burst --config coalesce_frames=true
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from typing import Iterator, List, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import (
+    QCoreApplication, QEvent, QEventLoop, QObject, QSettings,
+    PYQT_VERSION_STR, QT_VERSION_STR
+)
+from PyQt5.QtWidgets import QApplication
+
+from tests.stub_engine import StubEngine
+
+
+# (seconds since start, is_correction)
+StrokeEvent = Tuple[float, bool]
+
+DENSE_COLORS = "\n".join(
+    f"{num * 5}: #3EA7ED, #6ABBF1" for num in range(2000)
+)
+
+
+class PaintCounter(QObject):
+    def __init__(self) -> None:
+        super().__init__()
+        self.paints = 0
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() == QEvent.Paint:
+            self.paints += 1
+
+        return False
+
+
+def steady(duration: float, rate: float = 5.0) -> Iterator[StrokeEvent]:
+    count = int(duration * rate)
+    for index in range(count):
+        yield index / rate, False
+
+
+def burst(duration: float, rate: float = 20.0, length: float = 1.0, pause: float = 0.5) -> Iterator[StrokeEvent]:
+    timestamp = 0.0
+    while timestamp < duration:
+        burst_end = timestamp + length
+        while timestamp < burst_end:
+            yield timestamp, False
+            timestamp += 1.0 / rate
+
+        timestamp = burst_end + pause
+
+
+def undo_heavy(duration: float, rate: float = 8.0, undo_every: int = 4) -> Iterator[StrokeEvent]:
+    count = int(duration * rate)
+    for index in range(count):
+        yield index / rate, index % undo_every == undo_every - 1
+
+
+def milestones(duration: float, rate: float = 30.0) -> Iterator[StrokeEvent]:
+    return steady(duration, rate)
+
+
+SCENARIOS = {
+    "steady": (steady, dict()),
+    "burst": (burst, dict()),
+    "undo_heavy": (undo_heavy, dict()),
+    "milestones": (milestones, {"combo_colors": DENSE_COLORS}),
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+def wait_until(app: QApplication, target: float) -> None:
+    while True:
+        remaining = target - time.perf_counter()
+        if remaining <= 0:
+            return
+
+        app.processEvents(QEventLoop.AllEvents, max(1, int(remaining * 1000)))
+        if target - time.perf_counter() > 0.002:
+            time.sleep(0.001)
+
+
+def parse_value(value: str):
+    lowered = value.lower()
+    if lowered in ("true", "false"):
+        return lowered == "true"
+
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def isolate_settings() -> None:
+    # Keep benchmarks away from the user's Plover settings
+    settings_dir = tempfile.mkdtemp(prefix="plover_combo_bench")
+    QSettings.setDefaultFormat(QSettings.IniFormat)
+    QSettings.setPath(QSettings.IniFormat, QSettings.UserScope, settings_dir)
+    QCoreApplication.setOrganizationName("plover_combo_bench")
+
+
+def build_tool(engine: StubEngine, overrides: dict):
+    from plover_combo.combo_ui import ComboTool
+
+    tool = ComboTool(engine)
+    tool.session_log.directory = tempfile.mkdtemp(prefix="plover_combo_log")
+    previous = tool.config.copy()
+    for key, value in overrides.items():
+        setattr(tool.config, key, value)
+
+    tool.reload_config(previous)
+    return tool
+
+
+def run_scenario(app: QApplication, name: str, duration: float, overrides: dict) -> dict:
+    stream, scenario_overrides = SCENARIOS[name]
+    engine = StubEngine()
+    tool = build_tool(engine, {**scenario_overrides, **overrides})
+
+    paint_counter = PaintCounter()
+    app.installEventFilter(paint_counter)
+
+    latencies = []
+    drain_latencies = []
+    start_blocks = sys.getallocatedblocks()
+    start_objects = len(tool.findChildren(QObject))
+    start = time.perf_counter()
+
+    for offset, is_correction in stream(duration):
+        wait_until(app, start + offset)
+        stroke_start = time.perf_counter()
+        engine.stroke(is_correction)
+        enqueued = time.perf_counter()
+        # Run the GUI-side drain right away so it can be timed on its own
+        QCoreApplication.sendPostedEvents(None, QEvent.MetaCall)
+        latencies.append(enqueued - stroke_start)
+        drain_latencies.append(time.perf_counter() - enqueued)
+
+    # Let the last animations and cooldown run out
+    wait_until(app, time.perf_counter() + 0.5)
+    app.removeEventFilter(paint_counter)
+
+    result = {
+        "strokes": len(latencies),
+        "latency_p50_us": percentile(latencies, 0.50) * 1e6,
+        "latency_p99_us": percentile(latencies, 0.99) * 1e6,
+        "latency_max_us": max(latencies, default=0.0) * 1e6,
+        "drain_p50_us": percentile(drain_latencies, 0.50) * 1e6,
+        "drain_p99_us": percentile(drain_latencies, 0.99) * 1e6,
+        "paint_events": paint_counter.paints,
+        "frames": tool.frame_stats.as_dict(),
+        "allocated_blocks_delta": sys.getallocatedblocks() - start_blocks,
+        "qobject_children_delta": len(tool.findChildren(QObject)) - start_objects,
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if tool.profiler.enabled:
+        result["phases"] = tool.profiler.as_dict()
+
+    tool.hide()
+    tool.deleteLater()
+    app.processEvents()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="scenario to run (default: all)")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds of strokes per scenario")
+    parser.add_argument("--config", action="append", default=[], metavar="KEY=VALUE", help="ComboConfig override")
+    parser.add_argument("--output", default="bench_results.json", help="JSON results file")
+    args = parser.parse_args()
+
+    overrides = dict()
+    for item in args.config:
+        key, value = item.split("=", 1)
+        overrides[key] = parse_value(value)
+
+    isolate_settings()
+    app = QApplication(sys.argv[:1])
+
+    results = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "duration": args.duration,
+        "config": overrides,
+        "scenarios": dict(),
+    }
+
+    for name in args.scenario or sorted(SCENARIOS):
+        result = run_scenario(app, name, args.duration, overrides)
+        results["scenarios"][name] = result
+        print(
+            f"{name:>12}: {result['strokes']} strokes, "
+            f"p50 {result['latency_p50_us']:.1f}us, p99 {result['latency_p99_us']:.1f}us, "
+            f"drain p50 {result['drain_p50_us']:.1f}us, p99 {result['drain_p99_us']:.1f}us, "
+            f"{result['paint_events']} paints, peak RSS {result['peak_rss_kb']} KB"
+        )
+
+    with open(args.output, "w") as output_file:
+        json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
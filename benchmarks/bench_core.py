@@ -0,0 +1,171 @@
+"""
+Micro-benchmarks of the plugin's building blocks, outside any widget:
+
+    python benchmarks/bench_core.py
+    python benchmarks/bench_core.py --benchmark tier_lookup --scale 0.1
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import timeit
+
+from typing import Callable, Dict
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def per_call(func: Callable[[], None], runs: int) -> float:
+    return timeit.timeit(func, number=max(1, runs)) / max(1, runs)
+
+
+def bench_tier_lookup(scale: float) -> None:
+    from plover_combo.combo_colors import (
+        BAR_ALPHA, ComboPalette, convert_str_color_config, round_to_checkpoint
+    )
+    from plover_combo.combo_model import milestone_tier
+
+    runs = int(20 * scale)
+    for milestone_count in (10, 1000, 5000):
+        color_str = "\n".join(
+            f"{num * 5}: #3EA7ED, #6ABBF1" for num in range(milestone_count)
+        )
+        palette = ComboPalette(color_str, BAR_ALPHA)
+        color_dict, color_list = convert_str_color_config(color_str)
+        counters = [num * 5 + 1 for num in range(0, milestone_count, max(1, milestone_count // 100))]
+
+        def lookup_checkpoint() -> None:
+            for counter in counters:
+                color_dict[round_to_checkpoint(counter, color_list)]
+
+        # What the model and widget do on a tier change
+        def lookup_palette() -> None:
+            for counter in counters:
+                palette.tiers[milestone_tier(palette.milestones, counter)]
+
+        print(
+            f"  {milestone_count} milestones: "
+            f"round_to_checkpoint {per_call(lookup_checkpoint, runs) / len(counters) * 1e6:.2f}us, "
+            f"milestone_tier {per_call(lookup_palette, runs) / len(counters) * 1e6:.2f}us"
+        )
+
+
+def bench_adaptive_effects(scale: float) -> None:
+    from plover_combo.combo_adaptive import AdaptiveEffects, EffectLevel
+
+    effects = AdaptiveEffects()
+    stroke_count = int(1000000 * scale)
+    timestamp = 0.0
+    levels = [0] * len(EffectLevel)
+    start = time.perf_counter()
+    for count in range(stroke_count):
+        # Alternate between 5 and 20 strokes/s every 500 strokes
+        timestamp += 0.2 if count // 500 % 2 else 0.05
+        effects.record(timestamp)
+        effects.update(timestamp)
+        levels[effects.level] += 1
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {stroke_count} strokes in {elapsed:.2f}s "
+        f"({elapsed / max(1, stroke_count) * 1e6:.2f}us per stroke), "
+        f"strokes per level {dict(zip((level.name for level in EffectLevel), levels))}"
+    )
+
+
+def bench_config_diff(scale: float) -> None:
+    from plover_combo.combo_config import ComboConfig
+
+    config = ComboConfig()
+    other = config.copy()
+    other.horz_margin += 1
+    runs = int(100000 * scale)
+    for name, func in (
+        ("copy", config.copy),
+        ("eq", lambda: config == other),
+        ("diff", lambda: config.diff(other)),
+        ("diff (equal)", lambda: config.diff(config))
+    ):
+        print(f"  {name}: {per_call(func, runs) * 1e6:.2f}us")
+
+
+def bench_model_stroke(scale: float) -> None:
+    from plover_combo.combo_model import ComboModel
+
+    model = ComboModel([0, 10, 25, 50, 100, 250, 500, 1000, 2500])
+    stroke_count = int(1000000 * scale)
+    timestamp = 0.0
+    start = time.perf_counter()
+    for count in range(stroke_count):
+        timestamp += 0.2
+        model.stroke(timestamp, count % 500 == 499)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"  {stroke_count} strokes in {elapsed:.2f}s "
+        f"({elapsed / max(1, stroke_count) * 1e6:.2f}us per stroke), "
+        f"highscore {model.highscore}"
+    )
+
+
+def bench_session_log(scale: float) -> None:
+    from plover_combo.combo_log import SessionLog, SessionQuery
+    from plover_combo.combo_model import ComboRecord, EndReason
+
+    with tempfile.TemporaryDirectory(prefix="combo_log") as directory:
+        log = SessionLog(directory)
+        record_count = int(1000000 * scale)
+        timestamp = time.time() - record_count * 30
+
+        start = time.perf_counter()
+        for count in range(record_count):
+            log.append(ComboRecord(timestamp + count * 30, count % 400 + 1, count % 9, EndReason(count % 2)))
+            if count % 1000 == 999:
+                log.flush()
+
+        log.flush()
+        elapsed = time.perf_counter() - start
+        print(f"  {record_count} records written in {elapsed:.2f}s to {len(log.segments())} segments")
+
+        query = SessionQuery(log)
+        for name, func in (
+            ("totals", query.totals),
+            ("percentiles", lambda: query.percentiles([0.5, 0.9, 0.99])),
+            ("best_per_day", query.best_per_day)
+        ):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            summary = len(result) if name == "best_per_day" else result
+            print(f"  {name}: {elapsed:.2f}s -> {summary}")
+
+
+BENCHMARKS: Dict[str, Callable[[float], None]] = {
+    "adaptive_effects": bench_adaptive_effects,
+    "config_diff": bench_config_diff,
+    "model_stroke": bench_model_stroke,
+    "session_log": bench_session_log,
+    "tier_lookup": bench_tier_lookup,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmark", action="append", choices=sorted(BENCHMARKS), help="benchmark to run (default: all)")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiplier for iteration counts")
+    args = parser.parse_args()
+
+    from PyQt5.QtWidgets import QApplication
+
+    # Fonts and pixmaps need an application even without a widget
+    app = QApplication(sys.argv[:1])
+    for name in args.benchmark or sorted(BENCHMARKS):
+        print(f"{name}:")
+        BENCHMARKS[name](args.scale)
+
+
+if __name__ == "__main__":
+    main()
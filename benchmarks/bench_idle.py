@@ -0,0 +1,103 @@
+"""
+Idle cost of an open combo widget: after a short combo has expired, runs
+the Qt event loop untouched and counts process wakeups (context
+switches), CPU time and the timer and paint events Qt delivered, against
+the same loop with no widget open:
+
+    python benchmarks/bench_idle.py
+    python benchmarks/bench_idle.py --duration 10
+"""
+
+import argparse
+import os
+import resource
+import sys
+import time
+
+from typing import Dict
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QEvent, QObject, QTimer
+from PyQt5.QtWidgets import QApplication
+
+
+class EventCounter(QObject):
+    COUNTED = {
+        QEvent.Timer: "timer_events",
+        QEvent.Paint: "paint_events",
+        QEvent.UpdateRequest: "update_requests",
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.counts = dict.fromkeys(self.COUNTED.values(), 0)
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        name = self.COUNTED.get(event.type())
+        if name is not None:
+            self.counts[name] += 1
+
+        return False
+
+
+def measure_idle(app: QApplication, duration: float) -> Dict[str, float]:
+    event_counter = EventCounter()
+    app.installEventFilter(event_counter)
+    start_usage = resource.getrusage(resource.RUSAGE_SELF)
+    start_cpu = time.process_time()
+
+    # Block in the event loop like Plover does, rather than polling it
+    QTimer.singleShot(int(duration * 1000), app.quit)
+    app.exec_()
+
+    end_usage = resource.getrusage(resource.RUSAGE_SELF)
+    app.removeEventFilter(event_counter)
+    return {
+        "cpu_ms": (time.process_time() - start_cpu) * 1e3,
+        "context_switches": (
+            end_usage.ru_nvcsw - start_usage.ru_nvcsw
+            + end_usage.ru_nivcsw - start_usage.ru_nivcsw
+        ),
+        **event_counter.counts,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--duration", type=float, default=60.0, help="idle seconds per measurement")
+    args = parser.parse_args()
+
+    from bench_combo import StubEngine, build_tool, isolate_settings, wait_until
+
+    isolate_settings()
+    app = QApplication(sys.argv[:1])
+    baseline = measure_idle(app, args.duration)
+
+    engine = StubEngine()
+    tool = build_tool(engine, {"cooldown_duration": 300, "shake_on_all": True})
+    for _ in range(5):
+        engine.stroke(False)
+        wait_until(app, time.perf_counter() + 0.05)
+
+    # Let the cooldown expire and the reset animation finish
+    wait_until(app, time.perf_counter() + 1.0)
+    idle = tool.idle
+    widget = measure_idle(app, args.duration)
+
+    for name, result in (("no widget", baseline), ("widget open", widget)):
+        print(
+            f"{name:>12}: {result['cpu_ms']:.1f}ms CPU, "
+            f"{result['context_switches']} context switches, "
+            f"{result['timer_events']} timer events, "
+            f"{result['paint_events']} paints, "
+            f"{result['update_requests']} update requests over {args.duration:.0f}s"
+        )
+
+    print(f"widget idle before measuring: {idle}")
+    tool.end_session()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Offscreen per-frame paint cost comparisons between rendering strategies:
+
+    python benchmarks/bench_paint.py
+    python benchmarks/bench_paint.py --benchmark counter --frames 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from typing import Callable, Dict, Tuple
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QPoint, QRect, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen, QRegion
+from PyQt5.QtWidgets import QApplication, QWidget
+
+
+def time_frames(app: QApplication, frames: int, frame: Callable[[int], None]) -> float:
+    # Warm up caches before timing
+    for index in range(min(frames, 50)):
+        frame(index)
+        app.processEvents()
+
+    start = time.process_time()
+    for index in range(frames):
+        frame(index)
+
+    return (time.process_time() - start) / frames
+
+
+def build_counter(counter_class: type) -> Tuple[QWidget, QWidget, int, int]:
+    from plover_combo.combo_config import ComboConfig
+    from plover_combo.combo_resources import load_font
+
+    load_font()
+    config = ComboConfig()
+    font = QFont(config.counter_font_name, config.counter_font_size)
+
+    window = QWidget()
+    counter = counter_class(window)
+    counter.set_font(font, config.horz_margin, config.top_margin)
+    counter.set_text("1234")
+    counter.set_color(QColor(62, 167, 237))
+
+    text_rect = counter.text_rect()
+    width = int(text_rect.width() + config.horz_margin * 2)
+    height = int(text_rect.height() + config.top_margin + config.bottom_margin)
+    counter.set_canvas(width, height)
+    window.show()
+    return window, counter, width, height
+
+
+def bench_background(app: QApplication, frames: int) -> Dict[str, float]:
+    from plover_combo.combo_colors import string_hex_to_color
+    from plover_combo.combo_config import ComboConfig
+    from plover_combo.combo_render import DEFAULT_COLOR, RenderProfile
+
+    config = ComboConfig({"bg_opacity": 128, "border_width": 2})
+    profile = RenderProfile.from_config(config)
+    image = QImage(32, 32, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    rect = QRect(0, 0, 32, 32)
+
+    # What paint_event did before the RenderProfile, parsing colors per frame
+    def paint_from_config(index: int) -> None:
+        painter = QPainter(image)
+        painter.setCompositionMode(QPainter.CompositionMode_Overlay)
+        bg_color = string_hex_to_color(config.bg_color, DEFAULT_COLOR)
+        bg_color.setAlpha(config.bg_opacity)
+        painter.fillRect(rect, bg_color)
+        border_color = string_hex_to_color(config.border_color, DEFAULT_COLOR)
+        painter.setPen(QPen(border_color, config.border_width))
+        painter.drawRect(rect)
+        painter.end()
+
+    def paint_from_profile(index: int) -> None:
+        painter = QPainter(image)
+        painter.setCompositionMode(QPainter.CompositionMode_Overlay)
+        painter.fillRect(rect, profile.bg_color)
+        painter.setPen(profile.border_pen)
+        painter.drawRect(rect)
+        painter.end()
+
+    return {
+        "config": time_frames(app, frames, paint_from_config),
+        "profile": time_frames(app, frames, paint_from_profile),
+    }
+
+
+def bench_counter(app: QApplication, frames: int) -> Dict[str, float]:
+    from plover_combo.combo_config import ComboConfig
+    from plover_combo.combo_counter import GraphicsCounter, PaintedCounter
+
+    zoom_scale = ComboConfig().get_zoom_scale()
+    results = dict()
+
+    for counter_class in (GraphicsCounter, PaintedCounter):
+        window, counter, width, height = build_counter(counter_class)
+
+        # One zoom animation is ~11 frames at 60 Hz; replay it repeatedly
+        steps = 11
+
+        def frame(index: int) -> None:
+            progress = (index % steps) / (steps - 1)
+            scale = zoom_scale + (1.0 - zoom_scale) * progress
+            counter.zoom(QRectF(
+                width * (1.0 - scale) * 0.5,
+                height * (1.0 - scale),
+                width * scale,
+                height * scale
+            ))
+            QWidget.render(counter, image)
+
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        results[counter_class.__name__] = time_frames(app, frames, frame)
+        window.close()
+
+    return results
+
+
+def bench_counter_text(app: QApplication, frames: int) -> Dict[str, float]:
+    from plover_combo.combo_counter import GraphicsCounter, PaintedCounter
+
+    results = dict()
+    for counter_class in (GraphicsCounter, PaintedCounter):
+        window, counter, width, height = build_counter(counter_class)
+
+        # A stroke changes the text, measures it and paints it once
+        def frame(index: int) -> None:
+            counter.set_text(str(1000 + index))
+            counter.text_rect()
+            QWidget.render(counter, image)
+
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+        results[counter_class.__name__] = time_frames(app, frames, frame)
+        window.close()
+
+    return results
+
+
+def bench_force_repaint(app: QApplication, frames: int) -> Dict[str, float]:
+    from bench_combo import StubEngine, build_tool
+
+    results = dict()
+    for strategy, resize in (("invalidate", False), ("resize", True)):
+        engine = StubEngine()
+        tool = build_tool(engine, {"force_repaint": True, "force_repaint_resize": resize})
+        engine.stroke(False)
+        zoom_frame = tool.repaint_func(tool.counter_view.zoom)
+        full_rect = QRectF(0, 0, tool.width, tool.height)
+
+        # One counter animation frame followed by one frame tick
+        def frame(index: int) -> None:
+            zoom_frame(full_rect)
+            tool.on_frame()
+            app.processEvents()
+
+        results[strategy] = time_frames(app, frames, frame)
+        tool.hide()
+        tool.deleteLater()
+        app.processEvents()
+
+    return results
+
+
+def bench_header(app: QApplication, frames: int) -> Dict[str, float]:
+    from PyQt5.QtWidgets import QGraphicsDropShadowEffect, QLabel
+
+    from plover_combo.combo_config import ComboConfig
+    from plover_combo.combo_header import HeaderView
+    from plover_combo.combo_resources import load_font
+
+    load_font()
+    config = ComboConfig()
+    font = QFont(config.title_font_name, config.title_font_size)
+    shadow_color = QColor(62, 167, 237)
+
+    window = QWidget()
+    label = QLabel(window)
+    label.setText(config.title_text)
+    label.setFont(font)
+    shadow = QGraphicsDropShadowEffect()
+    shadow.setBlurRadius(0)
+    shadow.setOffset(config.shadow_x_offset, config.shadow_y_offset)
+    shadow.setColor(shadow_color)
+    label.setGraphicsEffect(shadow)
+    label.adjustSize()
+
+    header = HeaderView(window)
+    header.set_text(config.title_text)
+    header.set_font(font)
+    header.set_color(QColor(0, 0, 0))
+    header.set_shadow_offset(config.shadow_x_offset, config.shadow_y_offset)
+    header.set_shadow_color(shadow_color)
+    header.adjustSize()
+    window.show()
+
+    # Every stroke and animation frame repaints the whole window, header included
+    results = dict()
+    for strategy, widget in (("drop_shadow_effect", label), ("cached_pixmap", header)):
+        image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+        results[strategy] = time_frames(app, frames, lambda index: window.render(
+            image, QPoint(), QRegion(widget.geometry())
+        ))
+
+    window.close()
+    return results
+
+
+def legacy_label_style(color: QColor) -> str:
+    # What set_label_color used to apply on every tier change
+    return f"color: rgba({color.red()}, {color.green()}, {color.blue()}, {color.alpha()});"
+
+
+def bench_tier_change(app: QApplication, frames: int) -> Dict[str, float]:
+    from bench_combo import DENSE_COLORS, StubEngine, build_tool
+
+    engine = StubEngine()
+    tool = build_tool(engine, {"combo_colors": DENSE_COLORS})
+    tier_count = len(tool.palette.tiers)
+    styles = [legacy_label_style(tier.sub_color) for tier in tool.palette.tiers]
+
+    def palette_frame(index: int) -> None:
+        # Crossing a milestone every 5 strokes walks through the tiers
+        tool.model.tier = index % tier_count
+        tool.update_colors()
+        app.processEvents()
+
+    # update_colors as it was, with setStyleSheet in place of setPalette
+    def stylesheet_frame(index: int) -> None:
+        tier_index = index % tier_count
+        tool.model.tier = tier_index
+        tool.tier = tool.palette.tiers[tier_index]
+        tool.combo_header.set_shadow_color(tool.tier.main_color)
+        tool.highscore_header.setStyleSheet(styles[tier_index])
+        tool.counter_view.set_color(tool.tier.main_color)
+        tool.cooldown_bar.setBrush(tool.tier.sub_brush)
+        app.processEvents()
+
+    results = {
+        "palette": time_frames(app, frames, palette_frame),
+        "stylesheet": time_frames(app, frames, stylesheet_frame),
+    }
+    tool.end_session()
+    tool.hide()
+    tool.deleteLater()
+    app.processEvents()
+    return results
+
+
+BENCHMARKS = {
+    "background": bench_background,
+    "counter": bench_counter,
+    "counter_text": bench_counter_text,
+    "force_repaint": bench_force_repaint,
+    "header": bench_header,
+    "tier_change": bench_tier_change,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmark", action="append", choices=sorted(BENCHMARKS), help="benchmark to run (default: all)")
+    parser.add_argument("--frames", type=int, default=1000, help="frames per strategy")
+    args = parser.parse_args()
+
+    from bench_combo import isolate_settings
+
+    isolate_settings()
+    app = QApplication(sys.argv[:1])
+    for name in args.benchmark or sorted(BENCHMARKS):
+        print(f"{name}:")
+        for strategy, frame_time in BENCHMARKS[name](app, args.frames).items():
+            print(f"  {strategy:>20}: {frame_time * 1e6:.1f}us CPU per frame")
+
+
+if __name__ == "__main__":
+    main()
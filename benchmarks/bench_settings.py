@@ -0,0 +1,100 @@
+"""
+Startup restore cost of the per-key settings layout against the
+versioned JSON blob:
+
+    python benchmarks/bench_settings.py
+    python benchmarks/bench_settings.py --repeat 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from typing import Callable, Dict
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QSettings
+from PyQt5.QtWidgets import QApplication
+
+
+def write_layout(role: str, layout: str) -> None:
+    from plover_combo.combo_config import CONFIG_ITEMS, CONFIG_KEY, ComboConfig, dump_config
+
+    settings = QSettings()
+    settings.remove(role)
+    settings.beginGroup(role)
+    config = ComboConfig()
+    if layout == "per_key":
+        # As written by earlier versions of _save_state
+        for key, value in config.as_dict().items():
+            settings.setValue(key, value)
+    else:
+        settings.setValue(CONFIG_KEY, dump_config(config))
+        settings.setValue("highscore", config.highscore)
+
+    settings.endGroup()
+    settings.sync()
+
+
+def time_calls(repeat: int, func: Callable[[], None]) -> float:
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+
+    return (time.perf_counter() - start) / repeat
+
+
+def bench_layouts(app: QApplication, repeat: int) -> Dict[str, Dict[str, float]]:
+    from bench_combo import StubEngine, build_tool
+    from plover_combo.combo_ui import ComboTool
+
+    results = dict()
+    for layout in ("per_key", "blob"):
+        write_layout(ComboTool.ROLE, layout)
+        restored = build_tool(StubEngine(), dict())
+
+        def restore() -> None:
+            settings = QSettings()
+            settings.beginGroup(restored.ROLE)
+            restored._restore_state(settings)
+            settings.endGroup()
+
+        def construct() -> None:
+            tool = ComboTool(StubEngine())
+            tool.end_session()
+            tool.deleteLater()
+            app.processEvents()
+
+        results[layout] = {
+            "restore": time_calls(repeat, restore),
+            "construct": time_calls(max(1, repeat // 50), construct),
+        }
+        restored.end_session()
+        restored.deleteLater()
+        app.processEvents()
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=1000, help="restores per layout")
+    args = parser.parse_args()
+
+    from bench_combo import isolate_settings
+
+    isolate_settings()
+    app = QApplication(sys.argv[:1])
+    for layout, timings in bench_layouts(app, args.repeat).items():
+        print(
+            f"{layout:>8}: restore {timings['restore'] * 1e6:.1f}us, "
+            f"ComboTool() {timings['construct'] * 1e3:.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
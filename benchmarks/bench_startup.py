@@ -0,0 +1,95 @@
+"""
+Startup costs of the combo plugin: importing plover_combo.combo_ui in a
+fresh interpreter (with PyQt5 and Plover already imported, as they are
+when Plover loads plugins), and opening the tool for the first time
+against reopening it:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20 --reopens 50
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from typing import Dict, List
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PyQt5.QtWidgets import QApplication
+
+
+IMPORT_SCRIPT = """
+import sys, time
+sys.path.insert(0, {root!r})
+import PyQt5.QtWidgets, plover.gui_qt.tool, plover.gui_qt.utils
+start = time.perf_counter()
+import plover_combo.combo_ui
+print(time.perf_counter() - start)
+"""
+
+
+def import_times(runs: int) -> List[float]:
+    script = IMPORT_SCRIPT.format(root=ROOT)
+    times = []
+    for _ in range(runs):
+        output = subprocess.check_output([sys.executable, "-c", script])
+        times.append(float(output))
+
+    return times
+
+
+def open_times(app: QApplication, reopens: int) -> Dict[str, float]:
+    from bench_combo import StubEngine
+    from plover_combo.combo_resources import load_font
+    from plover_combo.combo_ui import ComboTool
+
+    def open_tool() -> float:
+        start = time.perf_counter()
+        tool = ComboTool(StubEngine())
+        elapsed = time.perf_counter() - start
+        tool.end_session()
+        tool.deleteLater()
+        app.processEvents()
+        return elapsed
+
+    first = open_tool()
+    reopen = statistics.median(open_tool() for _ in range(reopens))
+    return {
+        "first_open": first,
+        "reopen": reopen,
+        "font_loads": load_font.cache_info().misses,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to time the import in")
+    parser.add_argument("--reopens", type=int, default=20, help="tool reopens to time")
+    args = parser.parse_args()
+
+    times = import_times(args.runs)
+    print(
+        f"import combo_ui: median {statistics.median(times) * 1e3:.2f}ms, "
+        f"min {min(times) * 1e3:.2f}ms over {args.runs} runs"
+    )
+
+    from bench_combo import isolate_settings
+
+    isolate_settings()
+    app = QApplication(sys.argv[:1])
+    results = open_times(app, args.reopens)
+    print(
+        f"ComboTool(): first {results['first_open'] * 1e3:.2f}ms, "
+        f"reopen median {results['reopen'] * 1e3:.2f}ms, "
+        f"font added {results['font_loads']} time(s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
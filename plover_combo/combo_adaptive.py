@@ -0,0 +1,131 @@
+from collections import deque
+from enum import IntEnum
+from typing import Deque
+
+
+# Strokes within this many seconds make up the live stroke rate
+RATE_WINDOW = 1.0
+# A level is only left once the rate drops below this share of its threshold
+RESTORE_FRACTION = 0.75
+
+
+class EffectLevel(IntEnum):
+    FULL = 0
+    REDUCED = 1
+    MINIMAL = 2
+
+
+# Frame timer interval in ms per EffectLevel
+FRAME_INTERVALS = (16, 33, 50)
+
+
+class StrokeRate:
+    """
+    Strokes per second over the last `window` seconds of stroke
+    timestamps.
+    """
+
+    def __init__(self, window: float = RATE_WINDOW) -> None:
+        self.window = window
+        self.timestamps: Deque[float] = deque()
+
+    def record(self, timestamp: float) -> None:
+        self.timestamps.append(timestamp)
+
+    def rate(self, now: float) -> float:
+        timestamps = self.timestamps
+        cutoff = now - self.window
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+        return len(timestamps) / self.window
+
+    def clear(self) -> None:
+        self.timestamps.clear()
+
+
+class AdaptiveEffects:
+    """
+    Picks an EffectLevel from the live stroke rate. Levels step up as
+    soon as the rate reaches their threshold and step back down once it
+    falls below RESTORE_FRACTION of it, so a rate hovering around a
+    threshold doesn't flip effects on and off.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        reduce_rate: int = 8,
+        minimal_rate: int = 14
+    ) -> None:
+        self.stroke_rate = StrokeRate()
+        self.level = EffectLevel.FULL
+        self.configure(enabled, reduce_rate, minimal_rate)
+
+    def configure(self, enabled: bool, reduce_rate: int, minimal_rate: int) -> None:
+        self.enabled = enabled
+        self.thresholds = (0.0, float(reduce_rate), float(max(reduce_rate, minimal_rate)))
+        if not enabled:
+            self.reset()
+
+    def reset(self) -> None:
+        self.level = EffectLevel.FULL
+        self.stroke_rate.clear()
+
+    def record(self, timestamp: float) -> None:
+        if self.enabled:
+            self.stroke_rate.record(timestamp)
+
+    def update(self, now: float) -> bool:
+        """
+        Re-evaluates the level at time now; returns whether it changed.
+        """
+        if not self.enabled:
+            return False
+
+        rate = self.stroke_rate.rate(now)
+        thresholds = self.thresholds
+        level = self.level
+        while level < EffectLevel.MINIMAL and rate >= thresholds[level + 1]:
+            level += 1
+
+        while level > EffectLevel.FULL and rate < thresholds[level] * RESTORE_FRACTION:
+            level -= 1
+
+        if level == self.level:
+            return False
+
+        self.level = EffectLevel(level)
+        return True
+
+    @property
+    def frame_interval(self) -> int:
+        return FRAME_INTERVALS[self.level]
+
+    @property
+    def coalesce_frames(self) -> bool:
+        # Above full effects, strokes are only rendered on frame ticks
+        return self.level > EffectLevel.FULL
+
+    @property
+    def suppress_shakes(self) -> bool:
+        # Only the shakes from "Shake on every stroke"; milestones still shake
+        return self.level > EffectLevel.FULL
+
+    def zoom_duration(self, duration: int, now: float) -> int:
+        """
+        Counter zoom duration in ms: shortened to fit between strokes at
+        REDUCED, skipped (0) at MINIMAL.
+        """
+        if self.level == EffectLevel.FULL:
+            return duration
+
+        if self.level == EffectLevel.MINIMAL:
+            return 0
+
+        rate = self.stroke_rate.rate(now)
+        if rate <= 0:
+            return duration
+
+        return min(duration, int(1000 / rate))
+
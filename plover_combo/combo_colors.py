@@ -1,7 +1,6 @@
 from typing import Optional, List, Tuple, Dict
 
-from PyQt5.QtWidgets import QLabel
-from PyQt5.QtGui import QColor
+from PyQt5.QtGui import QColor, QBrush, QPalette
 
 BAR_ALPHA = 220
 COLORS = {
@@ -130,15 +129,46 @@ def round_to_checkpoint(num: int, color_nums: Optional[List[int]] = None) -> int
     return prev
 
 
-def set_label_color(label: QLabel, color: QColor) -> None:
-    values = "{r}, {g}, {b}, {a}".format(
-        r = color.red(),
-        g = color.green(),
-        b = color.blue(),
-        a = color.alpha()
-    )
+def label_palette(color: QColor) -> QPalette:
+    # Only the text role is set, everything else still comes from the parent
+    palette = QPalette()
+    palette.setColor(QPalette.WindowText, color)
+    return palette
 
-    label.setStyleSheet(f"color: rgba({values});")
+
+class ComboTier:
+    def __init__(self, milestone: int, main_color: QColor, sub_color: QColor, sub_opacity: int) -> None:
+        self.milestone = milestone
+        self.main_color = QColor(main_color)
+        self.sub_color = QColor(sub_color)
+        self.sub_color.setAlpha(sub_opacity)
+
+        self.sub_brush = QBrush(self.sub_color)
+        self._sub_palette: Optional[QPalette] = None
+
+    @property
+    def sub_palette(self) -> QPalette:
+        # Built on first use, since dense color configs have thousands of
+        # tiers; after that a tier change only hands over the same palette
+        if self._sub_palette is None:
+            self._sub_palette = label_palette(self.sub_color)
+
+        return self._sub_palette
+
+
+class ComboPalette:
+    """
+    Color tiers compiled once from the combo color string, so that
+    crossing a milestone is a lookup instead of parsing colors.
+    """
+
+    def __init__(self, string: str, sub_opacity: int) -> None:
+        color_dict, _ = convert_str_color_config(string)
+        self.milestones = sorted(color_dict.keys())
+        self.tiers = [
+            ComboTier(num, *color_dict[num], sub_opacity)
+            for num in self.milestones
+        ]
 
 
 if __name__ == "__main__":
@@ -146,4 +176,4 @@ if __name__ == "__main__":
     for num, (pri, sec) in conf.items():
         print(f"{num}: {hex(pri.rgb())}, {hex(sec.rgb())}")
 
-    print(l)
\ No newline at end of file
+    print(l)
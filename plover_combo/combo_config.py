@@ -1,5 +1,8 @@
+import json
+
 from enum import Enum
-from typing import Callable
+from operator import attrgetter
+from typing import Any, Callable, Dict, Set
 
 from plover_combo.combo_colors import COLOR_STR
 
@@ -25,14 +28,18 @@ CONFIG_ITEMS = {
     # Combo Settings
     "reset_on_undo": True,
     "cooldown_duration": 2000,
+    "save_interval": 10,
+    "session_log": True,
 
     # Force Repaint
     "force_repaint": False,
     "force_repaint_px": 1,
+    "force_repaint_resize": False,
 
     # Display Settings
     "alignment": ComboAlignment.CENTER,
     "bar_width": 12,
+    "coalesce_frames": False,
 
     # Widget Background
     "bg_opacity": 0,
@@ -57,6 +64,7 @@ CONFIG_ITEMS = {
     "subtitle_font_opacity": 220,
 
     # Counter Settings
+    "painted_counter": False,
     "counter_font_name": "Plover Retro",
     "counter_font_size": 65,
     "counter_font_opacity": 255,
@@ -69,10 +77,22 @@ CONFIG_ITEMS = {
     # Shake Animation
     "shake_enabled": True,
     "shake_on_all": False,
+    "shake_in_window": False,
     "shake_duration": 250,
     "shake_count": 20,
     "shake_intensity": 3,
 
+    # Adaptive Effects
+    "adaptive_effects": True,
+    "adaptive_reduce_rate": 8,
+    "adaptive_minimal_rate": 14,
+
+    # Diagnostics
+    "profiling": False,
+
+    # Settings Dialog
+    "live_preview": True,
+
     # Combo Colors
     "combo_colors": COLOR_STR
 }
@@ -83,12 +103,16 @@ CONFIG_NAMES = {
 
     "reset_on_undo": "Reset Combo on Undo",
     "cooldown_duration": "Cooldown Duration",
+    "save_interval": "Highscore Save Interval",
+    "session_log": "Record Combo History",
 
     "force_repaint": "Force Repaint (macOS)",
     "force_repaint_px": "Repaint Width (macOS)",
+    "force_repaint_resize": "Repaint by Resizing (Legacy)",
 
     "alignment": "Widget Alignment",
     "bar_width": "Cooldown Bar Thickness",
+    "coalesce_frames": "Render Once per Frame",
 
     "bg_color": "Background Color (Hex)",
     "bg_opacity": "Background Opacity (0-255)",
@@ -109,6 +133,7 @@ CONFIG_NAMES = {
     "subtitle_font_size": "Highscore Font Size",
     "subtitle_font_opacity": "Highscore Font Opacity (Hex)",
 
+    "painted_counter": "Lightweight Counter Renderer",
     "counter_font_name": "Counter Font Name",
     "counter_font_size": "Counter Font Size",
     "counter_font_opacity": "Counter Font Opacity",
@@ -120,9 +145,16 @@ CONFIG_NAMES = {
 
     "shake_enabled": "Enable Shake Animation",
     "shake_on_all": "Shake on every stroke",
+    "shake_in_window": "Shake Inside Window",
     "shake_duration": "Shake Animation Duration",
     "shake_count": "Shake Speed",
-    "shake_intensity": "Shake Intensity"
+    "shake_intensity": "Shake Intensity",
+
+    "adaptive_effects": "Reduce Effects When Stroking Fast",
+    "adaptive_reduce_rate": "Shorten Zoom Above",
+    "adaptive_minimal_rate": "Skip Zoom Above",
+
+    "profiling": "Record Stroke Timings"
 }
 
 
@@ -133,14 +165,18 @@ CONFIG_ORDER = [
     "Combo Settings",
     "reset_on_undo",
     "cooldown_duration",
+    "save_interval",
+    "session_log",
 
     "Force Repaint (macOS Window Shadow)",
     "force_repaint",
+    "force_repaint_resize",
     "force_repaint_px",
     
     "Display Settings",
     "alignment",
     "bar_width",
+    "coalesce_frames",
 
     "Widget Background",
     "bg_color",
@@ -165,6 +201,7 @@ CONFIG_ORDER = [
     "subtitle_font_opacity",
 
     "Counter Settings",
+    "painted_counter",
     "counter_font_name",
     "counter_font_size",
     "counter_font_opacity",
@@ -177,9 +214,18 @@ CONFIG_ORDER = [
     "Shake Animation",
     "shake_enabled",
     "shake_on_all",
+    "shake_in_window",
     "shake_duration",
     "shake_count",
     "shake_intensity",
+
+    "Adaptive Effects",
+    "adaptive_effects",
+    "adaptive_reduce_rate",
+    "adaptive_minimal_rate",
+
+    "Diagnostics (Ctrl+D to show, Ctrl+E to export)",
+    "profiling",
     
 ]
 
@@ -187,6 +233,7 @@ CONFIG_ORDER = [
 CONFIG_RANGES = {
     # Combo Settings
     "cooldown_duration": (100, 30000, 100, "ms"),
+    "save_interval": (1, 600, 1, "s"),
 
     # Force Repaint
     "force_repaint_px": (1, 10, 1, "px"),
@@ -222,34 +269,160 @@ CONFIG_RANGES = {
     # Shake Animation
     "shake_duration": (10, 500, 10, "ms"),
     "shake_count": (1, 100, 1, None),
-    "shake_intensity": (1, 100, 1, "px")
+    "shake_intensity": (1, 100, 1, "px"),
+
+    # Adaptive Effects
+    "adaptive_reduce_rate": (1, 50, 1, " strokes/s"),
+    "adaptive_minimal_rate": (1, 50, 1, " strokes/s")
 }
 
 
 CONFIG_TYPES = {k: type(v) for k, v in CONFIG_ITEMS.items()}
 
 
+# Settings are saved as one JSON blob under CONFIG_KEY
+CONFIG_KEY = "config"
+CONFIG_VERSION = 1
+# Runtime state saved under its own keys rather than in the blob
+CONFIG_STATE = ("highscore", "reset_highscore")
+# Upgrades blob values from version n to n + 1
+CONFIG_MIGRATIONS: Dict[int, Callable[[dict], dict]] = dict()
+
+
+CONFIG_KEYS = tuple(CONFIG_ITEMS.keys())
+get_config_values = attrgetter(*CONFIG_KEYS)
+
+
 class ComboConfig:
-    def __init__(self, values: dict = None):
-        if values is None:
-            values = dict()
+    """
+    One slot per CONFIG_ITEMS key. Values passed in are validated with
+    validate_value; copies, comparisons and diffs work on the slot
+    values as one tuple.
+    """
+
+    __slots__ = CONFIG_KEYS
 
+    def __init__(self, values: dict = None):
         for key, default in CONFIG_ITEMS.items():
-            if key in values:
-                setattr(self, key, values[key])
-            else:
-                setattr(self, key, default)
+            setattr(self, key, default)
+
+        if values is not None:
+            for key, value in values.items():
+                if key in CONFIG_ITEMS:
+                    setattr(self, key, validate_value(key, value))
+
+    def values(self) -> tuple:
+        return get_config_values(self)
 
     def copy(self) -> "ComboConfig":
-        value_dict = {k: getattr(self, k) for k in CONFIG_ITEMS.keys()}
-        return ComboConfig(value_dict)
+        config = ComboConfig.__new__(ComboConfig)
+        for key, value in zip(CONFIG_KEYS, get_config_values(self)):
+            setattr(config, key, value)
+
+        return config
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ComboConfig):
+            return NotImplemented
+
+        return get_config_values(self) == get_config_values(other)
+
+    __hash__ = None
 
     def get_zoom_scale(self) -> float:
         return self.zoom_scale_percent / 100
     
+    def diff(self, other: "ComboConfig") -> Set[str]:
+        values = get_config_values(self)
+        other_values = get_config_values(other)
+        if values == other_values:
+            return set()
+
+        return {
+            key for key, value, other_value in zip(CONFIG_KEYS, values, other_values)
+            if value != other_value
+        }
+
     def as_dict(self) -> dict:
-        results = dict()
-        for key in CONFIG_ITEMS.keys():
-            results[key] = getattr(self, key)
-        
-        return results
\ No newline at end of file
+        return dict(zip(CONFIG_KEYS, get_config_values(self)))
+
+
+def validate_value(key: str, value: Any) -> Any:
+    """
+    Checks a stored value against CONFIG_TYPES and clamps it to
+    CONFIG_RANGES; raises TypeError or ValueError if it is unusable.
+    """
+    field_type = CONFIG_TYPES[key]
+    if field_type == ComboAlignment:
+        if isinstance(value, ComboAlignment):
+            return value
+
+        if type(value) != int:
+            raise TypeError(f"{key}: expected int, got {type(value).__name__}")
+
+        return ComboAlignment(value)
+
+    if type(value) != field_type:
+        raise TypeError(f"{key}: expected {field_type.__name__}, got {type(value).__name__}")
+
+    if key in CONFIG_RANGES:
+        low, high = CONFIG_RANGES[key][:2]
+        value = min(max(value, low), high)
+
+    return value
+
+
+def dump_config(config: ComboConfig) -> str:
+    values = dict()
+    for key, value in config.as_dict().items():
+        if key in CONFIG_STATE:
+            continue
+
+        if isinstance(value, ComboAlignment):
+            value = value.value
+
+        values[key] = value
+
+    return json.dumps({"version": CONFIG_VERSION, "values": values}, separators=(",", ":"))
+
+
+def load_config(blob: str, config: ComboConfig = None) -> ComboConfig:
+    """
+    Parses a blob written by dump_config into config (or a new
+    ComboConfig). Unknown keys and invalid values are skipped; a blob
+    that cannot be read at all raises ValueError.
+    """
+    if config is None:
+        config = ComboConfig()
+
+    try:
+        data = json.loads(blob)
+        version = data["version"]
+        values = data["values"]
+    except (TypeError, KeyError) as error:
+        raise ValueError(f"Unreadable config blob: {error}") from error
+
+    if not isinstance(version, int) or not isinstance(values, dict):
+        raise ValueError("Unreadable config blob")
+
+    if version > CONFIG_VERSION:
+        raise ValueError(f"Unknown config blob version {version}")
+
+    while version < CONFIG_VERSION:
+        if version not in CONFIG_MIGRATIONS:
+            raise ValueError(f"No migration from config blob version {version}")
+
+        values = CONFIG_MIGRATIONS[version](values)
+        version += 1
+
+    for key, value in values.items():
+        if key not in CONFIG_ITEMS or key in CONFIG_STATE:
+            continue
+
+        try:
+            setattr(config, key, validate_value(key, value))
+        except (TypeError, ValueError):
+            continue
+
+    return config
+
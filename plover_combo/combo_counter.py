@@ -0,0 +1,121 @@
+from PyQt5.QtWidgets import (
+    QWidget, QGraphicsView, QGraphicsScene
+)
+from PyQt5.QtGui import (
+    QColor, QFont, QPainter, QPaintEvent, QStaticText, QTransform
+)
+from PyQt5.QtCore import Qt, QPointF, QRectF
+
+
+STYLESHEET = "border:0px; background:transparent;"
+
+# Matches the default QTextDocument margin used by QGraphicsTextItem
+TEXT_MARGIN = 4.0
+# Matches the margin QGraphicsView.fitInView keeps around the view
+FIT_MARGIN = 2.0
+
+
+class GraphicsCounter(QGraphicsView):
+    """
+    Counter drawn as a QGraphicsTextItem and zoomed with fitInView.
+    """
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setStyleSheet(STYLESHEET)
+
+        self.text_scene = QGraphicsScene(self)
+        self.setScene(self.text_scene)
+        self.counter_text = self.text_scene.addText("")
+
+    def set_font(self, font: QFont, x: float, y: float) -> None:
+        self.counter_text.setFont(font)
+        self.counter_text.setPos(x, y)
+
+    def set_text(self, text: str) -> None:
+        self.counter_text.setPlainText(text)
+
+    def set_color(self, color: QColor) -> None:
+        self.counter_text.setDefaultTextColor(color)
+
+    def text_rect(self) -> QRectF:
+        return self.counter_text.boundingRect()
+
+    def set_canvas(self, width: int, height: int) -> None:
+        self.setFixedSize(width, height)
+        self.text_scene.setSceneRect(0, 0, width, height)
+
+    def zoom(self, rect: QRectF) -> None:
+        self.fitInView(rect, Qt.KeepAspectRatio)
+
+
+class PaintedCounter(QWidget):
+    """
+    Counter painted directly from a cached QStaticText; zooming only
+    changes the painter transform of the next paint.
+    """
+
+    def __init__(self, parent: QWidget) -> None:
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+
+        self.counter_font = QFont()
+        self.color = QColor()
+        self.origin = QPointF(TEXT_MARGIN, TEXT_MARGIN)
+        self.view_rect = QRectF()
+
+        self.static_text = QStaticText()
+        self.static_text.setTextFormat(Qt.PlainText)
+        self.static_text.setPerformanceHint(QStaticText.AggressiveCaching)
+
+    def set_font(self, font: QFont, x: float, y: float) -> None:
+        self.counter_font = font
+        self.origin = QPointF(x + TEXT_MARGIN, y + TEXT_MARGIN)
+        self.static_text.prepare(QTransform(), font)
+        self.update()
+
+    def set_text(self, text: str) -> None:
+        self.static_text.setText(text)
+        self.static_text.prepare(QTransform(), self.counter_font)
+        self.update()
+
+    def set_color(self, color: QColor) -> None:
+        self.color = color
+        self.update()
+
+    def text_rect(self) -> QRectF:
+        size = self.static_text.size()
+        return QRectF(
+            0, 0,
+            size.width() + TEXT_MARGIN * 2,
+            size.height() + TEXT_MARGIN * 2
+        )
+
+    def set_canvas(self, width: int, height: int) -> None:
+        self.setFixedSize(width, height)
+
+    def zoom(self, rect: QRectF) -> None:
+        self.view_rect = rect
+        self.update()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        view_rect = self.view_rect
+        if view_rect.isEmpty():
+            view_rect = QRectF(self.rect())
+
+        # Same mapping as fitInView with Qt.KeepAspectRatio
+        target_width = self.width() - FIT_MARGIN * 2
+        target_height = self.height() - FIT_MARGIN * 2
+        scale = min(target_width / view_rect.width(), target_height / view_rect.height())
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.translate(self.width() / 2, self.height() / 2)
+        painter.scale(scale, scale)
+        painter.translate(-view_rect.center())
+
+        painter.setFont(self.counter_font)
+        painter.setPen(self.color)
+        painter.drawStaticText(self.origin, self.static_text)
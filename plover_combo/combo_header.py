@@ -0,0 +1,128 @@
+from math import ceil
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QPainter, QPaintEvent, QPixmap
+from PyQt5.QtCore import Qt, QPoint, QRect, QSize
+
+from plover_combo.combo_cache import LRUCache
+
+
+# Number of (text, font, offset, colors) header images kept around
+HEADER_CACHE_CAPACITY = 16
+
+
+def render_header(
+    text: str,
+    font: QFont,
+    color: QColor,
+    shadow_color: QColor,
+    shadow_offset: QPoint,
+    pixel_ratio: float
+) -> QPixmap:
+    """
+    Title text over a hard (unblurred) drop shadow, as a pixmap that
+    covers both.
+    """
+    text_size = QFontMetrics(font).size(0, text)
+    dx = shadow_offset.x()
+    dy = shadow_offset.y()
+
+    pixmap = QPixmap(
+        max(1, ceil((text_size.width() + abs(dx)) * pixel_ratio)),
+        max(1, ceil((text_size.height() + abs(dy)) * pixel_ratio))
+    )
+    pixmap.setDevicePixelRatio(pixel_ratio)
+    pixmap.fill(Qt.transparent)
+
+    # The shadow is a copy of the text, so it also takes on the text's alpha
+    shadow_color = QColor(shadow_color)
+    shadow_color.setAlphaF(shadow_color.alphaF() * color.alphaF())
+
+    text_rect = QRect(QPoint(max(0, -dx), max(0, -dy)), text_size)
+    painter = QPainter(pixmap)
+    painter.setRenderHint(QPainter.TextAntialiasing)
+    painter.setFont(font)
+    painter.setPen(shadow_color)
+    painter.drawText(text_rect.translated(dx, dy), Qt.AlignLeft | Qt.AlignVCenter, text)
+    painter.setPen(color)
+    painter.drawText(text_rect, Qt.AlignLeft | Qt.AlignVCenter, text)
+    painter.end()
+
+    return pixmap
+
+
+class HeaderView(QWidget):
+    """
+    Title label with a drop shadow, painted from a cached pixmap instead
+    of being re-rendered through a QGraphicsEffect on every repaint.
+    """
+
+    def __init__(self, parent: QWidget, capacity: int = HEADER_CACHE_CAPACITY) -> None:
+        super().__init__(parent)
+        self.cache = LRUCache(capacity)
+        self.text = ""
+        self.header_font = QFont()
+        self.color = QColor()
+        self.shadow_color = QColor()
+        self.shadow_offset = QPoint()
+        self.pixmap = None
+
+    def set_text(self, text: str) -> None:
+        self.text = text
+        self.invalidate(resize=True)
+
+    def set_font(self, font: QFont) -> None:
+        self.header_font = font
+        self.invalidate(resize=True)
+
+    def set_color(self, color: QColor) -> None:
+        self.color = QColor(color)
+        self.invalidate()
+
+    def set_shadow_color(self, color: QColor) -> None:
+        self.shadow_color = QColor(color)
+        self.invalidate()
+
+    def set_shadow_offset(self, x: int, y: int) -> None:
+        self.shadow_offset = QPoint(x, y)
+        self.invalidate(resize=True)
+
+    def invalidate(self, resize: bool = False) -> None:
+        self.pixmap = None
+        if resize:
+            self.updateGeometry()
+
+        self.update()
+
+    def header_pixmap(self) -> QPixmap:
+        if self.pixmap is None:
+            pixel_ratio = self.devicePixelRatioF()
+            key = (
+                self.text,
+                self.header_font.key(),
+                self.color.rgba(),
+                self.shadow_color.rgba(),
+                self.shadow_offset.x(),
+                self.shadow_offset.y(),
+                pixel_ratio
+            )
+            self.pixmap = self.cache.get(key, lambda: render_header(
+                self.text, self.header_font, self.color,
+                self.shadow_color, self.shadow_offset, pixel_ratio
+            ))
+
+        return self.pixmap
+
+    def sizeHint(self) -> QSize:
+        text_size = QFontMetrics(self.header_font).size(0, self.text)
+        return QSize(
+            text_size.width() + abs(self.shadow_offset.x()),
+            text_size.height() + abs(self.shadow_offset.y())
+        )
+
+    def minimumSizeHint(self) -> QSize:
+        return self.sizeHint()
+
+    def paintEvent(self, event: QPaintEvent) -> None:
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.header_pixmap())
@@ -0,0 +1,217 @@
+import mmap
+import os
+import struct
+import threading
+
+from collections import Counter
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List
+
+from plover_combo.combo_model import ComboRecord, EndReason
+
+
+# start (epoch seconds), length, peak tier, end reason, padding
+RECORD = struct.Struct("<dIBB2x")
+
+LOG_NAME = "combo_log"
+LOG_EXT = ".bin"
+# 64K records per segment
+SEGMENT_BYTES = RECORD.size * 65536
+MAX_SEGMENTS = 64
+
+
+class SessionLog:
+    """
+    Append-only log of finished combos as fixed-width binary records.
+
+    Records are buffered in memory by append and written by flush, which
+    may run on another thread. The log rotates into numbered segments,
+    oldest first, and drops the oldest segment past max_segments.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = SEGMENT_BYTES,
+        max_segments: int = MAX_SEGMENTS
+    ) -> None:
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.max_segments = max_segments
+        self.lock = threading.Lock()
+        self.buffer: List[ComboRecord] = []
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, LOG_NAME + LOG_EXT)
+
+    def segment_path(self, index: int) -> str:
+        return os.path.join(self.directory, f"{LOG_NAME}.{index}{LOG_EXT}")
+
+    def segments(self) -> List[str]:
+        # Oldest first, the live file last
+        paths = []
+        for index in range(self.max_segments - 1, 0, -1):
+            path = self.segment_path(index)
+            if os.path.exists(path):
+                paths.append(path)
+
+        if os.path.exists(self.path):
+            paths.append(self.path)
+
+        return paths
+
+    def append(self, record: ComboRecord) -> None:
+        with self.lock:
+            self.buffer.append(record)
+
+    def flush(self) -> None:
+        with self.lock:
+            records = self.buffer
+            self.buffer = []
+
+        if not records:
+            return
+
+        data = b"".join(
+            RECORD.pack(record.start, record.length, min(record.peak_tier, 255), record.reason)
+            for record in records
+        )
+
+        try:
+            self.write(data)
+        except Exception:
+            # Keep the records for the next flush, ahead of any appended since
+            with self.lock:
+                self.buffer[:0] = records
+
+            raise
+
+    def write(self, data: bytes) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+
+        if size and size + len(data) > self.segment_bytes:
+            self.rotate()
+            size = 0
+
+        # Unbuffered, so a failed write can be cut back off below; readers
+        # skip the trailing partial record of a write still in progress
+        with open(self.path, "ab", buffering=0) as log_file:
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[log_file.write(view):]
+            except OSError:
+                # Drop a partial write so later records stay aligned
+                log_file.truncate(size)
+                raise
+
+    def rotate(self) -> None:
+        oldest = self.segment_path(self.max_segments - 1)
+        if os.path.exists(oldest):
+            os.remove(oldest)
+
+        for index in range(self.max_segments - 2, 0, -1):
+            path = self.segment_path(index)
+            if os.path.exists(path):
+                os.replace(path, self.segment_path(index + 1))
+
+        os.replace(self.path, self.segment_path(1))
+
+    def records(self) -> Iterator[ComboRecord]:
+        for start, length, peak_tier, reason in self.raw_records():
+            yield ComboRecord(start, length, peak_tier, EndReason(reason))
+
+    def raw_records(self) -> Iterator[tuple]:
+        # Memory-mapped and unpacked one record at a time, never read whole
+        for path in self.segments():
+            with open(path, "rb") as log_file:
+                size = os.fstat(log_file.fileno()).st_size
+                size -= size % RECORD.size
+                if size == 0:
+                    continue
+
+                with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    view = memoryview(data)
+                    try:
+                        yield from RECORD.iter_unpack(view[:size])
+                    finally:
+                        view.release()
+
+
+class SessionQuery:
+    """
+    Aggregates over a SessionLog in a single streaming pass each; only
+    the per-length and per-day tallies are kept in memory.
+    """
+
+    def __init__(self, log: SessionLog) -> None:
+        self.log = log
+
+    def totals(self) -> Dict[str, int]:
+        combos = 0
+        strokes = 0
+        best = 0
+        reasons = [0] * len(EndReason)
+        for _, length, _, reason in self.log.raw_records():
+            combos += 1
+            strokes += length
+            reasons[reason] += 1
+            if length > best:
+                best = length
+
+        result = {
+            "combos": combos,
+            "strokes": strokes,
+            "best": best
+        }
+        for reason in EndReason:
+            result[reason.name.lower()] = reasons[reason]
+
+        return result
+
+    def length_counts(self) -> Counter:
+        return Counter(length for _, length, _, _ in self.log.raw_records())
+
+    def percentiles(self, fractions: List[float]) -> List[int]:
+        counts = self.length_counts()
+        total = sum(counts.values())
+        if total == 0:
+            return [0] * len(fractions)
+
+        lengths = sorted(counts)
+        results = []
+        for fraction in fractions:
+            target = fraction * total
+            seen = 0
+            for length in lengths:
+                seen += counts[length]
+                if seen >= target:
+                    break
+
+            results.append(length)
+
+        return results
+
+    def best_per_day(self) -> Dict[date, int]:
+        best: Dict[date, int] = dict()
+        # Local date of the last lookup and the epoch range it covers;
+        # records are mostly in order, so most share the previous day
+        day = None
+        day_start = day_end = 0.0
+        for start, length, _, _ in self.log.raw_records():
+            if not day_start <= start < day_end:
+                day = date.fromtimestamp(start)
+                day_start = datetime(day.year, day.month, day.day).timestamp()
+                next_day = day + timedelta(days=1)
+                day_end = datetime(next_day.year, next_day.month, next_day.day).timestamp()
+
+            if length > best.get(day, 0):
+                best[day] = length
+
+        return best
+
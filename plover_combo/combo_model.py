@@ -0,0 +1,136 @@
+from bisect import bisect_right
+from enum import IntEnum, IntFlag
+from typing import List, NamedTuple, Optional
+
+
+class ComboEvent(IntFlag):
+    NONE = 0
+    INCREMENT = 1
+    RESET = 2
+    TIER_CHANGED = 4
+    NEW_HIGHSCORE = 8
+    SHAKE = 16
+    COMBO_ENDED = 32
+
+
+class EndReason(IntEnum):
+    COOLDOWN = 0
+    UNDO = 1
+    CLOSED = 2
+
+
+class ComboRecord(NamedTuple):
+    start: float
+    length: int
+    peak_tier: int
+    reason: EndReason
+
+
+def milestone_tier(milestones: List[int], num: int) -> int:
+    """
+    Index of the last milestone reached by num; milestones must be sorted
+    and start with 0.
+    """
+    if num <= 0:
+        return 0
+
+    return bisect_right(milestones, num) - 1
+
+
+class ComboModel:
+    """
+    Counter, highscore and cooldown logic without any Qt or Plover
+    dependency. Every input returns the ComboEvent flags that the view
+    has to act on.
+    """
+
+    def __init__(
+        self,
+        milestones: Optional[List[int]] = None,
+        highscore: int = 0,
+        reset_on_undo: bool = True,
+        shake_on_all: bool = False,
+        cooldown_duration: int = 2000
+    ) -> None:
+        self.counter = 0
+        self.tier = 0
+        self.highscore = highscore
+        self.setting_highscore = False
+        self.deadline = None
+        self.start = 0.0
+        self.last_combo: Optional[ComboRecord] = None
+        self.configure(milestones, reset_on_undo, shake_on_all, cooldown_duration)
+
+    def configure(
+        self,
+        milestones: Optional[List[int]],
+        reset_on_undo: bool,
+        shake_on_all: bool,
+        cooldown_duration: int
+    ) -> None:
+        if milestones is None:
+            milestones = [0]
+
+        self.milestones = sorted(milestones)
+        self.milestone_set = set(self.milestones)
+        self.reset_on_undo = reset_on_undo
+        self.shake_on_all = shake_on_all
+        self.cooldown = cooldown_duration / 1000
+        self.tier = milestone_tier(self.milestones, self.counter)
+
+    def reset_highscore(self) -> None:
+        self.highscore = 0
+        self.setting_highscore = False
+
+    def stroke(self, timestamp: float, is_correction: bool = False) -> ComboEvent:
+        events = self.expire(timestamp)
+
+        if self.reset_on_undo and is_correction:
+            return events | self.reset(EndReason.UNDO)
+
+        return events | self.increment(timestamp)
+
+    def expire(self, timestamp: float) -> ComboEvent:
+        if self.deadline is None or timestamp < self.deadline:
+            return ComboEvent.NONE
+
+        return self.reset(EndReason.COOLDOWN)
+
+    def increment(self, timestamp: float) -> ComboEvent:
+        self.counter += 1
+        if self.counter == 1:
+            self.start = timestamp
+
+        self.deadline = timestamp + self.cooldown
+        events = ComboEvent.INCREMENT
+
+        is_milestone = self.counter in self.milestone_set
+        if is_milestone:
+            self.tier = milestone_tier(self.milestones, self.counter)
+            events |= ComboEvent.TIER_CHANGED
+
+        if is_milestone or self.shake_on_all:
+            events |= ComboEvent.SHAKE
+
+        if self.counter > self.highscore:
+            self.highscore = self.counter
+            events |= ComboEvent.NEW_HIGHSCORE
+            if not self.setting_highscore:
+                events |= ComboEvent.SHAKE
+
+            self.setting_highscore = True
+
+        return events
+
+    def reset(self, reason: EndReason = EndReason.COOLDOWN) -> ComboEvent:
+        events = ComboEvent.RESET | ComboEvent.TIER_CHANGED
+        if self.counter > 0:
+            self.last_combo = ComboRecord(self.start, self.counter, self.tier, reason)
+            events |= ComboEvent.COMBO_ENDED
+
+        self.counter = 0
+        self.tier = 0
+        self.deadline = None
+        self.setting_highscore = False
+        return events
+
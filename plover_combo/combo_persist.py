@@ -0,0 +1,77 @@
+import threading
+
+from typing import Callable, Optional
+
+from plover import log
+
+
+class StateWriter:
+    """
+    Write-behind persistence: the GUI only hands over the latest state,
+    and a background thread writes it at most once per interval.
+    """
+
+    def __init__(self, write: Callable[[dict], None], interval: float) -> None:
+        self.write = write
+        self.interval = interval
+        self.writes = 0
+
+        self.lock = threading.Lock()
+        self.pending: Optional[dict] = None
+        self.dirty = threading.Event()
+        self.stopping = threading.Event()
+
+        self.thread = threading.Thread(
+            target=self.run, name="plover-combo-writer", daemon=True
+        )
+        self.thread.start()
+
+    def mark_dirty(self, state: dict) -> None:
+        # Newer values win, keys from earlier calls are kept
+        with self.lock:
+            if self.pending is None:
+                self.pending = dict(state)
+            else:
+                self.pending.update(state)
+
+        self.dirty.set()
+
+    def run(self) -> None:
+        while not self.stopping.is_set():
+            self.dirty.wait()
+
+            # Debounce: keep collecting changes until the interval is up,
+            # or write right away when stopping
+            self.stopping.wait(self.interval)
+            self.write_pending()
+
+        self.write_pending()
+
+    def write_pending(self) -> None:
+        with self.lock:
+            state = self.pending
+            self.pending = None
+            self.dirty.clear()
+
+        if state is None:
+            return
+
+        try:
+            self.write(state)
+            self.writes += 1
+        except Exception:
+            log.error("combo: failed to save state", exc_info=True)
+
+            # Keep the state around for the next attempt
+            with self.lock:
+                if self.pending is None:
+                    self.pending = state
+                else:
+                    self.pending = {**state, **self.pending}
+
+            self.dirty.set()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self.stopping.set()
+        self.dirty.set()
+        self.thread.join(timeout)
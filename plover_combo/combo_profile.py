@@ -0,0 +1,143 @@
+import os
+import time
+
+from typing import Any, Callable, Dict, List, Optional
+
+
+PROFILE_ENV = "PLOVER_COMBO_PROFILE"
+PROFILE_PHASES = [
+    "render_frame",
+    "update_colors",
+    "adjust_window",
+    "animate_counter",
+    "animate_cooldown",
+    "animate_shake"
+]
+HISTOGRAM_BUCKETS = 24
+
+
+def profiling_forced() -> bool:
+    return os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+class LatencyHistogram:
+    """
+    Fixed-size histogram with power-of-two microsecond buckets; bucket n
+    holds samples below 2^n us.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.counts = [0] * HISTOGRAM_BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        micros = int(seconds * 1e6)
+        self.counts[min(micros.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, fraction: float) -> float:
+        # Upper bound of the bucket holding the percentile, in us
+        if self.count == 0:
+            return 0.0
+
+        target = fraction * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return float(1 << bucket)
+
+        return float(1 << (HISTOGRAM_BUCKETS - 1))
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "p50_us": self.percentile(0.50),
+            "p99_us": self.percentile(0.99),
+            "max_us": self.max * 1e6,
+            "buckets": list(self.counts)
+        }
+
+
+class PhaseProfiler:
+    """
+    Times the hot-path methods of a widget by shadowing them with timed
+    wrappers on the instance; removing the wrappers restores the plain
+    class methods, so disabled profiling costs nothing.
+    """
+
+    def __init__(self, phases: Optional[List[str]] = None) -> None:
+        if phases is None:
+            phases = PROFILE_PHASES
+
+        self.phases = phases
+        self.histograms: Dict[str, LatencyHistogram] = {
+            phase: LatencyHistogram() for phase in phases
+        }
+        self.target: Any = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.target is not None
+
+    def attach(self, target: Any) -> None:
+        if self.target is target:
+            return
+
+        self.detach()
+        for phase in self.phases:
+            setattr(target, phase, self.timed(getattr(target, phase), self.histograms[phase]))
+
+        self.target = target
+
+    def detach(self) -> None:
+        if self.target is None:
+            return
+
+        for phase in self.phases:
+            self.target.__dict__.pop(phase, None)
+
+        self.target = None
+
+    def timed(self, func: Callable, histogram: LatencyHistogram) -> Callable:
+        perf_counter = time.perf_counter
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.record(perf_counter() - start)
+
+        return wrapper
+
+    def clear(self) -> None:
+        for histogram in self.histograms.values():
+            histogram.clear()
+
+    def summary(self) -> str:
+        lines = []
+        for phase, histogram in self.histograms.items():
+            lines.append(
+                f"{phase}: n={histogram.count} "
+                f"p50<{histogram.percentile(0.50):.0f}us "
+                f"p99<{histogram.percentile(0.99):.0f}us "
+                f"max={histogram.max * 1e6:.0f}us"
+            )
+
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict:
+        return {
+            phase: histogram.as_dict()
+            for phase, histogram in self.histograms.items()
+        }
@@ -0,0 +1,220 @@
+import random
+
+from typing import Callable, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from PyQt5.QtCore import QPoint
+from PyQt5.QtGui import QColor, QFont, QFontMetricsF, QPen
+
+from plover_combo.combo_colors import string_hex_to_color
+from plover_combo.combo_config import ComboAlignment, ComboConfig
+
+
+DEFAULT_COLOR = QColor(0, 0, 0)
+
+
+def shake_key_values(shake_count: int, shake_intensity: int) -> List[Tuple[float, QPoint]]:
+    """
+    Keyframe offsets for one shake, ending back at the origin.
+    """
+    key_values = []
+    animation_time = 0.0
+    shake_interval = 1.0 / shake_count
+    for count in range(shake_count):
+        key_values.append((
+            animation_time,
+            QPoint(
+                random.randint(-1, 1) * shake_intensity,
+                random.randint(-1, 1) * shake_intensity
+            )
+        ))
+        animation_time += shake_interval
+
+    key_values.append((1.0, QPoint()))
+    return key_values
+
+
+class RenderProfile(NamedTuple):
+    """
+    Paint-ready values derived from a ComboConfig. Built on every config
+    reload so that painting and animating never parse config strings.
+    """
+
+    # Widget Background
+    bg_color: Optional[QColor]
+    border_pen: Optional[QPen]
+    top_padding: int
+    bottom_padding: int
+
+    # Fonts
+    title_font: QFont
+    title_color: QColor
+    subtitle_font: QFont
+    counter_font: QFont
+    digit_widths: Tuple[float, ...]
+
+    # Counter & Cooldown Bar
+    alignment: ComboAlignment
+    top_margin: int
+    bottom_margin: int
+    horz_margin: int
+    bar_width: int
+    zoom_scale: float
+    counter_anim_duration: int
+
+    # Shake Animation
+    shake_key_values: List[Tuple[float, QPoint]]
+    shake_in_window: bool
+    shake_padding: int
+    shake_duration: int
+
+    @classmethod
+    def from_config(cls, config: ComboConfig) -> "RenderProfile":
+        fields = dict()
+        for _, build_fields in PROFILE_BUILDERS:
+            fields.update(build_fields(config))
+
+        return cls(**fields)
+
+    def updated(self, config: ComboConfig, changed: Set[str]) -> "RenderProfile":
+        """
+        Copy with only the fields derived from the changed config keys
+        rebuilt.
+        """
+        fields = dict()
+        for keys, build_fields in PROFILE_BUILDERS:
+            if not keys.isdisjoint(changed):
+                fields.update(build_fields(config))
+
+        if not fields:
+            return self
+
+        return self._replace(**fields)
+
+    def counter_advance(self, text: str) -> float:
+        # Only digits are ever displayed on the counter
+        return sum(self.digit_widths[ord(char) - 48] for char in text)
+
+
+def background_fields(config: ComboConfig) -> dict:
+    bg_color = None
+    if config.bg_opacity > 0:
+        bg_color = QColor(string_hex_to_color(config.bg_color, DEFAULT_COLOR))
+        bg_color.setAlpha(config.bg_opacity)
+
+    border_pen = None
+    if config.border_width > 0:
+        border_color = string_hex_to_color(config.border_color, DEFAULT_COLOR)
+        border_pen = QPen(border_color, config.border_width)
+
+    return dict(
+        bg_color=bg_color,
+        border_pen=border_pen,
+        top_padding=config.top_padding,
+        bottom_padding=config.bottom_padding
+    )
+
+
+def title_fields(config: ComboConfig) -> dict:
+    title_color = QColor(string_hex_to_color(config.title_font_color, DEFAULT_COLOR))
+    title_color.setAlpha(config.title_font_opacity)
+
+    return dict(
+        title_font=QFont(config.title_font_name, config.title_font_size),
+        title_color=title_color
+    )
+
+
+def subtitle_fields(config: ComboConfig) -> dict:
+    return dict(
+        subtitle_font=QFont(config.subtitle_font_name, config.subtitle_font_size)
+    )
+
+
+def counter_fields(config: ComboConfig) -> dict:
+    counter_font = QFont(config.counter_font_name, config.counter_font_size)
+    counter_metrics = QFontMetricsF(counter_font)
+    digit_widths = tuple(
+        counter_metrics.horizontalAdvance(str(digit)) for digit in range(10)
+    )
+
+    return dict(
+        counter_font=counter_font,
+        digit_widths=digit_widths
+    )
+
+
+def layout_fields(config: ComboConfig) -> dict:
+    return dict(
+        alignment=config.alignment,
+        top_margin=config.top_margin,
+        bottom_margin=config.bottom_margin,
+        horz_margin=config.horz_margin,
+        bar_width=config.bar_width,
+        zoom_scale=config.get_zoom_scale(),
+        counter_anim_duration=config.counter_anim_duration
+    )
+
+
+def shake_fields(config: ComboConfig) -> dict:
+    # Room around the content so an in-window shake isn't clipped
+    shake_padded = config.shake_enabled and config.shake_in_window
+
+    return dict(
+        shake_key_values=shake_key_values(config.shake_count, config.shake_intensity),
+        shake_in_window=config.shake_in_window,
+        shake_padding=config.shake_intensity if shake_padded else 0,
+        shake_duration=config.shake_duration
+    )
+
+
+# Config keys each group of RenderProfile fields is derived from
+PROFILE_BUILDERS: List[Tuple[FrozenSet[str], Callable[[ComboConfig], dict]]] = [
+    (frozenset({
+        "bg_opacity", "bg_color", "border_width", "border_color",
+        "top_padding", "bottom_padding"
+    }), background_fields),
+    (frozenset({
+        "title_font_name", "title_font_size", "title_font_color", "title_font_opacity"
+    }), title_fields),
+    (frozenset({"subtitle_font_name", "subtitle_font_size"}), subtitle_fields),
+    (frozenset({"counter_font_name", "counter_font_size"}), counter_fields),
+    (frozenset({
+        "alignment", "top_margin", "bottom_margin", "horz_margin",
+        "bar_width", "zoom_scale_percent", "counter_anim_duration"
+    }), layout_fields),
+    (frozenset({
+        "shake_enabled", "shake_in_window", "shake_count",
+        "shake_intensity", "shake_duration"
+    }), shake_fields),
+]
+
+
+class FrameStats:
+    """
+    Counts how many strokes were folded into each rendered frame.
+    """
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.strokes = 0
+        self.max_strokes = 0
+
+    def record(self, strokes: int) -> None:
+        self.frames += 1
+        self.strokes += strokes
+        self.max_strokes = max(self.max_strokes, strokes)
+
+    def strokes_per_frame(self) -> float:
+        if self.frames == 0:
+            return 0.0
+
+        return self.strokes / self.frames
+
+    def as_dict(self) -> dict:
+        return {
+            "frames": self.frames,
+            "strokes": self.strokes,
+            "max_strokes_per_frame": self.max_strokes,
+            "strokes_per_frame": self.strokes_per_frame()
+        }
+
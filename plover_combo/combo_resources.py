@@ -0,0 +1,23 @@
+from functools import lru_cache
+
+from PyQt5.QtGui import QFontDatabase
+
+
+ICON_RESOURCE = ":/combo/icon.svg"
+FONT_RESOURCE = ":/combo/PloverRetro.ttf"
+
+
+def register_resources() -> None:
+    # Importing the compiled module registers it with Qt, and Python only
+    # ever runs it once per process
+    from plover_combo import resources_rc
+
+
+@lru_cache(maxsize=None)
+def load_font() -> int:
+    """
+    Adds the bundled font to the application font database on first use;
+    later calls return the same font ID instead of adding a duplicate.
+    """
+    register_resources()
+    return QFontDatabase.addApplicationFont(FONT_RESOURCE)
@@ -1,92 +1,181 @@
-import random
+import json
+import math
+import os
 import sys
+import time
 
-from typing import Any, Callable
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
 
+from plover import log
 from plover.engine import StenoEngine
 from plover.gui_qt.tool import Tool
 from plover.gui_qt.utils import ToolBar
-from plover.oslayer.config import PLUGINS_PLATFORM
+from plover.oslayer.config import CONFIG_DIR, PLUGINS_PLATFORM
 from plover.steno import Stroke
 
 from PyQt5.QtWidgets import (
     QWidget, QPushButton, QGraphicsView, 
     QGraphicsScene, QApplication, QGraphicsTextItem,
     QGridLayout, QLabel, QSpacerItem, QSizePolicy,
-    QGraphicsDropShadowEffect, QAction
+    QAction, QFileDialog
 )
 from PyQt5.QtGui import (
     QMouseEvent, QFont, QKeyEvent, QPen, QBrush, 
-    QFontDatabase, QColor, QKeySequence, QPainter,
+    QColor, QKeySequence, QPainter,
     QPaintEvent
 )
 from PyQt5.QtCore import (
     Qt, QPoint, QVariantAnimation, QRectF, QSettings,
-    QTimer, QRect
+    QTimer, QRect, QAbstractAnimation, pyqtSignal
 )
 
-from plover_combo.combo_colors import (
-    round_to_checkpoint, set_label_color,
-    string_hex_to_color, convert_str_color_config
+from plover_combo.combo_adaptive import AdaptiveEffects
+from plover_combo.combo_colors import ComboPalette
+from plover_combo.combo_counter import (
+    STYLESHEET, GraphicsCounter, PaintedCounter
 )
 from plover_combo.combo_config import (
-    CONFIG_ITEMS, CONFIG_TYPES, ComboAlignment, 
-    ComboConfig
+    CONFIG_ITEMS, CONFIG_KEY, CONFIG_TYPES, ComboAlignment, 
+    ComboConfig, dump_config, load_config, validate_value
 )
+from plover_combo.combo_header import HeaderView
+from plover_combo.combo_log import SessionLog
+from plover_combo.combo_model import ComboEvent, ComboModel, EndReason
+from plover_combo.combo_persist import StateWriter
+from plover_combo.combo_profile import PhaseProfiler, profiling_forced
+from plover_combo.combo_render import FrameStats, RenderProfile
+from plover_combo.combo_resources import ICON_RESOURCE, load_font, register_resources
 from plover_combo.config_ui import ConfigUI
-from plover_combo.resources_rc import *
 
 
-STYLESHEET = "border:0px; background:transparent;"
-DEFAULT_COLOR = QColor(0, 0, 0)
+PROFILE_OVERLAY_INTERVAL = 500
+PROFILE_OVERLAY_STYLESHEET = "color: white; background: rgba(0, 0, 0, 180); padding: 4px;"
+
+# (config keys, ComboTool method) pairs run by reload_config when any of
+# the keys changed, in order
+CONFIG_APPLIERS = [
+    (frozenset({"combo_colors", "subtitle_font_opacity"}), "apply_palette"),
+    (frozenset({
+        "combo_colors", "subtitle_font_opacity", "reset_on_undo",
+        "shake_on_all", "cooldown_duration"
+    }), "apply_model"),
+    (frozenset({
+        "adaptive_effects", "adaptive_reduce_rate", "adaptive_minimal_rate"
+    }), "apply_adaptive"),
+    (frozenset({"profiling"}), "apply_profiling"),
+    (frozenset({"save_interval"}), "apply_save_interval"),
+]
+WIDGET_APPLIERS = [
+    (frozenset({"combo_colors", "subtitle_font_opacity"}), "update_colors"),
+    (frozenset({
+        "title_text", "title_font_name", "title_font_size",
+        "title_font_color", "title_font_opacity"
+    }), "apply_title"),
+    (frozenset({"shadow_x_offset", "shadow_y_offset"}), "apply_shadow"),
+    (frozenset({"subtitle_font_name", "subtitle_font_size"}), "apply_subtitle"),
+    (frozenset({"highscore"}), "update_highscore"),
+    (frozenset({"painted_counter"}), "apply_counter_renderer"),
+    (frozenset({
+        "counter_font_name", "counter_font_size", "horz_margin", "top_margin"
+    }), "apply_counter_font"),
+    (frozenset({
+        "title_text", "title_font_name", "title_font_size",
+        "subtitle_font_name", "subtitle_font_size",
+        "painted_counter", "counter_font_name", "counter_font_size",
+        "top_margin", "bottom_margin", "horz_margin", "bar_width",
+        "top_padding", "bottom_padding",
+        "shake_enabled", "shake_in_window", "shake_intensity"
+    }), "apply_layout"),
+    (frozenset({"bg_opacity", "bg_color", "border_width", "border_color"}), "update"),
+]
+
+# Plover loads ICON for its tool menu right after importing this module
+register_resources()
 
 
 class ComboTool(Tool):
     TITLE = "Combo Counter"
-    ICON = ":/combo/icon.svg"
+    ICON = ICON_RESOURCE
     ROLE = "combo"
 
+    strokes_ready = pyqtSignal()
+
     def __init__(self, engine: StenoEngine) -> None:
         super().__init__(engine)
         self.setObjectName("combo")
+
+        # (timestamp, is_correction) pairs handed over by the engine
+        self.stroke_queue: Deque[Tuple[float, bool]] = deque()
+        self.drain_pending = False
+        self.strokes_ready.connect(self.drain_strokes, Qt.QueuedConnection)
         engine.signal_connect("stroked", self.on_stroke)
 
-        QFontDatabase.addApplicationFont(":/combo/PloverRetro.ttf")
+        load_font()
 
         self.drag_position = QPoint()
-        self.counter = 0
+        self.idle = False
         self.repaint_offset = False
-        self.setting_highscore = False
+        self.repaint_requested = False
+        self.counter_width = None
+        self.clear_pending()
+        self.frame_stats = FrameStats()
+        self.profiler = PhaseProfiler()
+        self.effects = AdaptiveEffects()
+        self.setup_frame_timer()
 
         self.config = ComboConfig()
         self.restore_state()
+        self.model = ComboModel(highscore=self.config.highscore)
+        self.session_log = SessionLog(os.path.join(CONFIG_DIR, "plover_combo"))
+        self.state_writer = StateWriter(self.write_state, self.config.save_interval)
 
         self.reload_config()
         self.setup_actions()
         self.setup_header()
         self.setup_counter()
         self.setup_cooldown_bar()
+        self.setup_animations()
+        self.setup_cooldown_timer()
+        self.setup_profile_overlay()
         self.setup_layout()
 
         self.finished.connect(self.save_state)
-
-        self.timer = QTimer()
+        self.finished.connect(self.end_session)
+        QApplication.instance().aboutToQuit.connect(self.end_session)
 
     def _restore_state(self, settings: QSettings) -> None:
+        self.legacy_keys = []
+        blob = settings.value(CONFIG_KEY)
+        if blob is None:
+            self.restore_legacy_state(settings)
+        else:
+            try:
+                load_config(blob, self.config)
+            except ValueError:
+                log.warning("combo: ignoring unreadable settings", exc_info=True)
+
+        try:
+            self.config.highscore = max(0, settings.value("highscore", 0, type=int))
+        except TypeError:
+            pass
+
+    def restore_legacy_state(self, settings: QSettings) -> None:
+        # Settings saved one key per field by earlier versions
         for field_name in CONFIG_ITEMS.keys():
             if settings.contains(field_name):
+                self.legacy_keys.append(field_name)
                 try:
                     field_type = CONFIG_TYPES[field_name]
                     if field_type == ComboAlignment:
-                        field_value = settings.value(field_name, type=int)
-                        setattr(self.config, field_name, field_value.value)
+                        field_value = settings.value(field_name)
+                        if not isinstance(field_value, ComboAlignment):
+                            field_value = int(field_value)
                     else:
-                        setattr(
-                            self.config, 
-                            field_name, 
-                            settings.value(field_name, type=field_type)
-                        )
-                except TypeError:
+                        field_value = settings.value(field_name, type=field_type)
+
+                    setattr(self.config, field_name, validate_value(field_name, field_value))
+                except (TypeError, ValueError):
                     continue
 
             elif (
@@ -96,78 +185,270 @@ class ComboTool(Tool):
                 self.config.force_repaint = True
 
     def _save_state(self, settings: QSettings) -> None:
-        for key, value in self.config.as_dict().items():
-            if type(value) == ComboAlignment:
-                value = ComboAlignment(value)
-            
-            settings.setValue(key, value)
+        settings.setValue(CONFIG_KEY, dump_config(self.config))
+        settings.setValue("highscore", self.config.highscore)
+
+        # Drop the per-key layout once the blob has replaced it
+        for key in self.legacy_keys:
+            if key != "highscore":
+                settings.remove(key)
+
+        self.legacy_keys = []
+
+    def write_state(self, state: dict) -> None:
+        # Runs on the writer thread, so it uses its own QSettings
+        # The writer hands the same dict back on failure, so leave it intact
+        if state.get("session_log", False):
+            self.session_log.flush()
+
+        settings_state = {key: value for key, value in state.items() if key != "session_log"}
+        if settings_state:
+            settings = QSettings()
+            settings.beginGroup(self.ROLE)
+            for key, value in settings_state.items():
+                settings.setValue(key, value)
+
+            settings.endGroup()
+            settings.sync()
+
+    def persist_highscore(self) -> None:
+        self.state_writer.mark_dirty({"highscore": self.model.highscore})
+
+    def log_combo(self) -> None:
+        if not self.config.session_log:
+            return
+
+        # Stroke timestamps are monotonic; the log keeps wall clock time
+        record = self.model.last_combo
+        start = time.time() - (time.monotonic() - record.start)
+        self.session_log.append(record._replace(start=start))
+        self.state_writer.mark_dirty({"session_log": True})
+
+    def end_session(self) -> None:
+        # A combo still running when the tool closes is logged as well
+        if self.model.reset(EndReason.CLOSED) & ComboEvent.COMBO_ENDED:
+            self.log_combo()
+
+        # A running animation would otherwise step a half-deleted counter
+        self.counter_animation.stop()
+        self.shake_animation.stop()
+        self.state_writer.stop()
 
     def paint_event(self, event: QPaintEvent) -> None:
         painter = QPainter(self)
+        profile = self.profile
 
-        if self.config.bg_opacity > 0:
+        if self.config.force_repaint and not self.config.force_repaint_resize:
+            # Wipe whatever is left in the backing store from older frames
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(self.rect(), Qt.transparent)
+
+        if profile.bg_color is not None:
             painter.setCompositionMode(QPainter.CompositionMode_Overlay)
-            bg_color = string_hex_to_color(self.config.bg_color, DEFAULT_COLOR)
-            bg_color.setAlpha(self.config.bg_opacity)
-            painter.fillRect(self.repaint_rect(), bg_color)
+            painter.fillRect(self.repaint_rect(), profile.bg_color)
         else:
             painter.setCompositionMode(QPainter.CompositionMode_Clear)
             painter.fillRect(self.repaint_rect(), Qt.transparent)
 
-        if self.config.border_width > 0:
+        if profile.border_pen is not None:
             painter.setCompositionMode(QPainter.CompositionMode_Overlay)
-            border_color = string_hex_to_color(self.config.border_color, DEFAULT_COLOR)
-            painter.setPen(QPen(border_color, self.config.border_width))
+            painter.setPen(profile.border_pen)
             painter.drawRect(self.repaint_rect())
 
     def on_settings(self) -> None:
-        config_dialog = ConfigUI(self.config.copy(), self)
+        original = self.config.copy()
+        config_dialog = ConfigUI(self.config.copy(), self, self.preview_config)
         if config_dialog.exec():
-            self.config = config_dialog.temp_config
-            self.reload_config()
+            self.apply_config(config_dialog.temp_config)
+        else:
+            # Undo whatever the live preview applied
+            self.apply_config(original)
+
+    def preview_config(self, config: ComboConfig) -> None:
+        # The dialog keeps editing its config, so apply a snapshot of it;
+        # the highscore is only reset once the dialog is accepted
+        config = config.copy()
+        config.reset_highscore = False
+        self.apply_config(config)
+
+    def apply_config(self, config: ComboConfig) -> None:
+        previous = self.config
+        self.config = config
+        self.reload_config(previous)
     
-    def on_stroke(self, stroke: Stroke) -> None:
-        if self.config.reset_on_undo and stroke.is_correction:
-            self.reset_counter()
+    def on_toggle_profile(self) -> None:
+        if self.profile_overlay.isVisible():
+            self.profile_overlay_timer.stop()
+            self.profile_overlay.hide()
             return
-        
-        self.increment_counter()
 
-    def on_translate(self, undo: list, do: list, _) -> None:
-        if self.config.reset_on_undo and len(undo) == 1:
-            self.reset_counter()
+        self.update_profile_overlay()
+        self.profile_overlay.show()
+        self.profile_overlay.raise_()
+        self.profile_overlay_timer.start()
+
+    def on_export_profile(self) -> None:
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Export Stroke Timings", "combo_timings.json", "JSON Files (*.json)"
+        )
+        if not file_name:
             return
-        
-        self.increment_counter()
 
-    def reload_config(self) -> None:
+        with open(file_name, "w") as timings_file:
+            json.dump(self.profile_data(), timings_file, indent=2)
+
+    def profile_data(self) -> dict:
+        return {
+            "enabled": self.profiler.enabled,
+            "phases": self.profiler.as_dict(),
+            "frames": self.frame_stats.as_dict()
+        }
+
+    def update_profile_overlay(self) -> None:
+        if not self.profiler.enabled:
+            self.profile_overlay.setText(
+                "Stroke timings are off.\nEnable them under Diagnostics (Ctrl+S)."
+            )
+        else:
+            self.profile_overlay.setText(
+                f"{self.profiler.summary()}\n"
+                f"strokes/frame: {self.frame_stats.strokes_per_frame():.2f} "
+                f"(max {self.frame_stats.max_strokes})\n"
+                f"effects: {'idle' if self.idle else self.effects.level.name.lower()} "
+                f"({self.effects.stroke_rate.rate(time.monotonic()):.1f} strokes/s)"
+            )
+
+        self.profile_overlay.adjustSize()
+
+    def on_stroke(self, stroke: Stroke) -> None:
+        self.queue_stroke(stroke.is_correction)
+
+    def on_translate(self, undo: list, do: list, _) -> None:
+        self.queue_stroke(len(undo) == 1)
+
+    def queue_stroke(self, is_correction: bool) -> None:
+        # Runs in the engine's callback, possibly off the GUI thread; only
+        # record the stroke and make sure a drain is on its way
+        self.stroke_queue.append((time.monotonic(), is_correction))
+        if not self.drain_pending:
+            self.drain_pending = True
+            self.strokes_ready.emit()
+
+    def drain_strokes(self) -> None:
+        self.drain_pending = False
+        self.idle = False
+        stroke_queue = self.stroke_queue
+        while stroke_queue:
+            timestamp, is_correction = stroke_queue.popleft()
+            self.effects.record(timestamp)
+            self.apply_events(self.model.stroke(timestamp, is_correction))
+
+        self.update_effects(time.monotonic())
+
+        # Everything queued since the last drain is shown in one go
+        self.request_frame()
+
+    def on_cooldown_timeout(self) -> None:
+        now = time.monotonic()
+        events = self.model.expire(now)
+        if events:
+            self.apply_events(events)
+            self.request_frame()
+        else:
+            # Strokes moved the deadline since the timer was started
+            self.schedule_cooldown(now)
+
+    def reload_config(self, previous: Optional[ComboConfig] = None) -> None:
+        """
+        Applies the current config. Given the config it replaces, only the
+        settings that differ from it are applied.
+        """
         if self.config.reset_highscore:
-            self.config.highscore = 0
+            self.model.reset_highscore()
             self.config.reset_highscore = False
-            self.config.setting_highscore = False
+            self.persist_highscore()
 
-        self.zoom_scale = self.config.get_zoom_scale()
-        self.counter_font = QFont(self.config.counter_font_name, self.config.counter_font_size)
-        self.title_font = QFont(self.config.title_font_name, self.config.title_font_size)
-        self.subtitle_font = QFont(self.config.subtitle_font_name, self.config.subtitle_font_size)
+        # The dialog edits a copy, so keep any highscore set in the meantime
+        self.config.highscore = self.model.highscore
 
-        self.title_color = string_hex_to_color(self.config.title_font_color, DEFAULT_COLOR)
-        self.title_color.setAlpha(self.config.title_font_opacity)
-        self.combo_colors, self.milestones = convert_str_color_config(self.config.combo_colors)
-
-        self.main_color, self.sub_color = self.combo_colors[0]
-        self.sub_color.setAlpha(self.config.subtitle_font_opacity)
+        if previous is None:
+            changed = set(CONFIG_ITEMS.keys())
+            self.profile = RenderProfile.from_config(self.config)
+        else:
+            changed = previous.diff(self.config)
+            self.profile = self.profile.updated(self.config, changed)
 
+        # Widget appliers only run once the widgets exist
+        appliers = CONFIG_APPLIERS
         if hasattr(self, "combo_header"):
-            set_label_color(self.combo_header, self.title_color)
-            self.combo_header.setText(self.config.title_text)
+            appliers = CONFIG_APPLIERS + WIDGET_APPLIERS
 
-        if hasattr(self, "combo_header_shadow"):
-            self.combo_header_shadow.setXOffset(self.config.shadow_x_offset)
-            self.combo_header_shadow.setYOffset(self.config.shadow_y_offset)
+        for keys, applier in appliers:
+            if not keys.isdisjoint(changed):
+                getattr(self, applier)()
 
-        if hasattr(self, "highscore_header"):
-            self.update_highscore()
+    def apply_palette(self) -> None:
+        self.palette = ComboPalette(self.config.combo_colors, self.config.subtitle_font_opacity)
+
+    def apply_model(self) -> None:
+        self.model.configure(
+            self.palette.milestones,
+            self.config.reset_on_undo,
+            self.config.shake_on_all and not self.effects.suppress_shakes,
+            self.config.cooldown_duration
+        )
+        self.tier = self.palette.tiers[self.model.tier]
+
+    def apply_adaptive(self) -> None:
+        self.effects.configure(
+            self.config.adaptive_effects,
+            self.config.adaptive_reduce_rate,
+            self.config.adaptive_minimal_rate
+        )
+        self.apply_effect_level()
+
+    def apply_profiling(self) -> None:
+        if self.config.profiling or profiling_forced():
+            self.profiler.attach(self)
+        else:
+            self.profiler.detach()
+
+    def apply_save_interval(self) -> None:
+        self.state_writer.interval = self.config.save_interval
+
+    def apply_title(self) -> None:
+        self.combo_header.set_text(self.config.title_text)
+        self.combo_header.set_font(self.profile.title_font)
+        self.combo_header.set_color(self.profile.title_color)
+
+    def apply_shadow(self) -> None:
+        self.combo_header.set_shadow_offset(
+            self.config.shadow_x_offset, self.config.shadow_y_offset
+        )
+
+    def apply_subtitle(self) -> None:
+        self.highscore_header.setFont(self.profile.subtitle_font)
+        self.update_highscore()
+
+    def apply_counter_renderer(self) -> None:
+        old_view = self.counter_view
+        self.counter_animation.stop()
+        self.setup_counter()
+        self.layout.replaceWidget(old_view, self.counter_view)
+        # Keep the cooldown bar drawn over the counter's bottom row
+        self.counter_view.stackUnder(self.cooldown_view)
+        self.counter_view.show()
+        old_view.deleteLater()
+
+    def apply_counter_font(self) -> None:
+        self.counter_view.set_font(
+            self.profile.counter_font, self.profile.horz_margin, self.profile.top_margin
+        )
+
+    def apply_layout(self) -> None:
+        self.counter_width = None
+        self.set_content_offset(self.shake_offset)
+        self.animate()
 
     def setup_actions(self) -> None:
         self.close_action = QAction(self)
@@ -182,38 +463,47 @@ class ComboTool(Tool):
         self.settings_action.setShortcut(QKeySequence("Ctrl+S"))
         self.addAction(self.settings_action)
 
+        self.profile_action = QAction(self)
+        self.profile_action.setText("Show Stroke Timings")
+        self.profile_action.triggered.connect(self.on_toggle_profile)
+        self.profile_action.setShortcut(QKeySequence("Ctrl+D"))
+        self.addAction(self.profile_action)
+
+        self.export_profile_action = QAction(self)
+        self.export_profile_action.setText("Export Stroke Timings")
+        self.export_profile_action.triggered.connect(self.on_export_profile)
+        self.export_profile_action.setShortcut(QKeySequence("Ctrl+E"))
+        self.addAction(self.export_profile_action)
+
     def setup_header(self) -> None:
-        self.combo_header = QLabel(self)
-        self.combo_header.setText(self.config.title_text)
-        self.combo_header.setFont(self.title_font)
-        set_label_color(self.combo_header, self.title_color)
-
-        self.combo_header_shadow = QGraphicsDropShadowEffect()
-        self.combo_header_shadow.setBlurRadius(0)
-        self.combo_header_shadow.setXOffset(self.config.shadow_x_offset)
-        self.combo_header_shadow.setYOffset(self.config.shadow_y_offset)
-        self.combo_header_shadow.setColor(self.main_color)
-        self.combo_header.setGraphicsEffect(self.combo_header_shadow)
+        self.combo_header = HeaderView(self)
+        self.combo_header.set_text(self.config.title_text)
+        self.combo_header.set_font(self.profile.title_font)
+        self.combo_header.set_color(self.profile.title_color)
+        self.combo_header.set_shadow_offset(
+            self.config.shadow_x_offset, self.config.shadow_y_offset
+        )
+        self.combo_header.set_shadow_color(self.tier.main_color)
         
         self.highscore_header = QLabel(self)
         self.update_highscore()
-        self.highscore_header.setFont(self.subtitle_font)
-        set_label_color(self.highscore_header, self.sub_color)
+        self.highscore_header.setFont(self.profile.subtitle_font)
+        self.highscore_header.setPalette(self.tier.sub_palette)
 
     def setup_counter(self) -> None:
-        self.text_view = QGraphicsView(self)
-        self.text_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.text_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        self.text_view.setStyleSheet(STYLESHEET)
-
-        self.text_scene = QGraphicsScene(self)
-        self.text_view.setScene(self.text_scene)
-        self.counter_text = self.text_scene.addText(str(self.counter), self.counter_font)
-        self.counter_text.setPos(self.config.horz_margin, self.config.top_margin)
-        self.counter_text.setDefaultTextColor(self.main_color)
-
-        self.text_view.mouseMoveEvent = self.view_mouse_move
-        self.text_view.mousePressEvent = self.view_mouse_press
+        if self.config.painted_counter:
+            self.counter_view = PaintedCounter(self)
+        else:
+            self.counter_view = GraphicsCounter(self)
+
+        self.counter_view.set_color(self.tier.main_color)
+        self.counter_view.set_font(
+            self.profile.counter_font, self.profile.horz_margin, self.profile.top_margin
+        )
+        self.counter_view.set_text(str(self.model.counter))
+
+        self.counter_view.mouseMoveEvent = self.view_mouse_move
+        self.counter_view.mousePressEvent = self.view_mouse_press
     
     def setup_cooldown_bar(self) -> None:
         self.cooldown_view = QGraphicsView(self)
@@ -224,26 +514,62 @@ class ComboTool(Tool):
         self.cooldown_scene = QGraphicsScene(self)
         self.cooldown_view.setScene(self.cooldown_scene)
         self.cooldown_pen = QPen(Qt.NoPen)
-        self.cooldown_brush = QBrush(self.sub_color)
         self.cooldown_bar = self.cooldown_scene.addRect(
             QRectF(),
             self.cooldown_pen,
-            self.cooldown_brush
+            self.tier.sub_brush
         )
 
         self.cooldown_view.mouseMoveEvent = self.view_mouse_move
         self.cooldown_view.mousePressEvent = self.view_mouse_press
 
+    def setup_animations(self) -> None:
+        # Animations are created once and retargeted on every stroke
+        self.counter_animation = QVariantAnimation(self)
+        self.counter_animation.valueChanged.connect(
+            self.repaint_func(lambda x: self.counter_view.zoom(x))
+        )
+        self.counter_animation.finished.connect(self.check_idle)
+
+        self.shake_origin = QPoint()
+        self.shake_offset = QPoint()
+        self.shake_in_window = False
+        self.shake_animation = QVariantAnimation(self)
+        self.shake_animation.valueChanged.connect(self.on_shake_frame)
+        self.shake_animation.finished.connect(self.check_idle)
+
+    def setup_frame_timer(self) -> None:
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.effects.frame_interval)
+        self.timer.timeout.connect(self.on_frame)
+
+    def setup_profile_overlay(self) -> None:
+        # Floats above the layout and is only shown on demand
+        self.profile_overlay = QLabel(self)
+        self.profile_overlay.setStyleSheet(PROFILE_OVERLAY_STYLESHEET)
+        self.profile_overlay.hide()
+
+        self.profile_overlay_timer = QTimer(self)
+        self.profile_overlay_timer.setInterval(PROFILE_OVERLAY_INTERVAL)
+        self.profile_overlay_timer.timeout.connect(self.update_profile_overlay)
+
+    def setup_cooldown_timer(self) -> None:
+        # Fires the reset at the model's cooldown deadline
+        self.cooldown_timer = QTimer(self)
+        self.cooldown_timer.setSingleShot(True)
+        self.cooldown_timer.setTimerType(Qt.PreciseTimer)
+        self.cooldown_timer.timeout.connect(self.on_cooldown_timeout)
+
     def setup_layout(self) -> None:
         self.setWindowFlags(self.windowFlags() | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         self.setStyleSheet("QWidget#combo {background:transparent;}")
 
         self.layout = QGridLayout()
-        self.layout.setContentsMargins(0, self.config.top_padding, 0, self.config.bottom_padding)
+        self.set_content_offset(self.shake_offset)
         self.layout.addWidget(self.combo_header, 0, 0, 1, 1, Qt.AlignCenter)
         self.layout.addWidget(self.highscore_header, 1, 0, 1, 1, Qt.AlignCenter)
-        self.layout.addWidget(self.text_view, 2, 0, 2, 1)
+        self.layout.addWidget(self.counter_view, 2, 0, 2, 1)
         self.layout.addWidget(self.cooldown_view, 3, 0, 1, 1)
         self.setLayout(self.layout)
 
@@ -251,7 +577,6 @@ class ComboTool(Tool):
         self.mousePressEvent = self.view_mouse_press
         self.paintEvent = self.paint_event
 
-        self.adjustSize()
         self.animate()
         self.show()
 
@@ -263,60 +588,148 @@ class ComboTool(Tool):
         if event.buttons() & Qt.LeftButton:
             self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
     
-    def increment_counter(self) -> None:
-        self.counter += 1
-        shaked = False
+    def apply_events(self, events: ComboEvent) -> None:
+        if not events:
+            return
 
-        if self.counter in self.combo_colors:
-            self.update_colors()
-        
-        self.animate()
+        if events & ComboEvent.RESET:
+            self.pending_reset = True
+            self.pending_animate = True
+
+        if events & ComboEvent.INCREMENT:
+            self.pending_strokes += 1
+            self.pending_animate = True
+            self.schedule_cooldown(time.monotonic())
+
+        if events & ComboEvent.TIER_CHANGED:
+            self.pending_colors = True
+
+        if events & ComboEvent.SHAKE:
+            self.pending_shake = True
+
+        if events & ComboEvent.NEW_HIGHSCORE:
+            self.config.highscore = self.model.highscore
+            self.pending_highscore = True
+            self.persist_highscore()
+
+        if events & ComboEvent.COMBO_ENDED:
+            self.log_combo()
+
+    def clear_pending(self) -> None:
+        self.pending_strokes = 0
+        self.pending_reset = False
+        self.pending_colors = False
+        self.pending_animate = False
+        self.pending_shake = False
+        self.pending_highscore = False
+
+    def schedule_cooldown(self, now: float) -> None:
+        deadline = self.model.deadline
+        if deadline is None:
+            self.cooldown_timer.stop()
+        elif not self.cooldown_timer.isActive():
+            self.cooldown_timer.start(max(0, math.ceil((deadline - now) * 1000)))
+
+    def request_frame(self) -> None:
+        if not self.pending_animate:
+            return
+
+        if not (self.config.coalesce_frames or self.effects.coalesce_frames):
+            self.render_frame()
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def on_frame(self) -> None:
+        if self.pending_animate:
+            self.render_frame()
+
+        if self.repaint_requested:
+            self.repaint_requested = False
+            self.update()
+
+        if self.model.deadline is None:
+            # Combo is over and the bar has been cleared
+            if not self.repaint_requested:
+                self.timer.stop()
+                self.check_idle()
 
+            return
+
+        self.update_effects(time.monotonic())
+        self.animate_cooldown()
+        if self.config.force_repaint:
+            self.request_repaint()
+
+    def check_idle(self) -> None:
         if (
-            (self.counter in self.combo_colors and self.counter > 0)
-            or self.config.shake_on_all
+            self.model.counter == 0
+            and not self.timer.isActive()
+            and self.counter_animation.state() == QAbstractAnimation.Stopped
+            and self.shake_animation.state() == QAbstractAnimation.Stopped
         ):
-            shaked = True
-            self.animate_shake()
+            self.enter_idle()
+
+    def enter_idle(self) -> None:
+        # No timer, animation or repaint runs until the next stroke is
+        # drained; the first frame after that starts with full effects
+        self.idle = True
+        self.cooldown_timer.stop()
+        self.effects.reset()
+        self.apply_effect_level()
+
+    def update_effects(self, now: float) -> None:
+        if self.effects.update(now):
+            self.apply_effect_level()
+
+    def apply_effect_level(self) -> None:
+        self.model.shake_on_all = self.config.shake_on_all and not self.effects.suppress_shakes
+        self.timer.setInterval(self.effects.frame_interval)
+
+    def render_frame(self) -> None:
+        self.frame_stats.record(self.pending_strokes)
+
+        if self.pending_reset:
+            # A stroke drained along with the reset may have started a new
+            # combo, whose deadline still needs the timer
+            self.schedule_cooldown(time.monotonic())
+            self.cooldown_bar.setRect(QRectF())
 
-        if self.counter > self.config.highscore:
-            self.config.highscore = self.counter
-            self.highscore_header.setText(f"HI {self.config.highscore}")
-            if not (self.setting_highscore or shaked):
-                self.animate_shake()
+        if self.pending_colors:
+            self.update_colors()
 
-            self.setting_highscore = True
-    
-    def reset_counter(self) -> None:
-        self.counter = 0
-        if hasattr(self, "cooldown_animation") and self.cooldown_animation is not None:
-            self.cooldown_animation.stop()
-            self.cooldown_bar.setRect(QRectF())
+        if self.pending_animate:
+            self.animate()
 
-        self.setting_highscore = False
-        self.update_colors()
-        self.animate()
+        if self.pending_shake:
+            self.animate_shake()
+
+        if self.pending_highscore:
+            self.update_highscore()
+
+        self.clear_pending()
     
     def update_highscore(self) -> None:
         self.highscore_header.setText(f"HI {self.config.highscore}")
     
     def update_colors(self) -> None:
-        color_index = self.counter
-        if self.counter not in self.combo_colors:
-            color_index = round_to_checkpoint(self.counter, self.milestones)
-        
-        self.main_color, self.sub_color = self.combo_colors[color_index]
-        self.sub_color.setAlpha(self.config.subtitle_font_opacity)
+        self.tier = self.palette.tiers[self.model.tier]
 
-        self.combo_header_shadow.setColor(self.main_color)
-        set_label_color(self.highscore_header, self.sub_color)
-        self.counter_text.setDefaultTextColor(self.main_color)
-        self.cooldown_brush.setColor(self.sub_color)
-        self.cooldown_bar.setBrush(self.cooldown_brush)
+        self.combo_header.set_shadow_color(self.tier.main_color)
+        self.highscore_header.setPalette(self.tier.sub_palette)
+        self.counter_view.set_color(self.tier.main_color)
+        self.cooldown_bar.setBrush(self.tier.sub_brush)
 
     def animate(self) -> None:
-        self.counter_text.setPlainText(str(self.counter))
-        self.adjust_window()
+        counter_str = str(self.model.counter)
+        self.counter_view.set_text(counter_str)
+
+        # Geometry only needs to be recomputed when the counter changes width
+        counter_width = self.profile.counter_advance(counter_str)
+        if counter_width != self.counter_width or self.repaint_offset:
+            self.counter_width = counter_width
+            self.adjust_window()
+
         self.animate_counter()
         self.animate_cooldown()
 
@@ -324,103 +737,118 @@ class ComboTool(Tool):
         if self.repaint_offset:
             self.repaint()
 
-        self.layout.setContentsMargins(0, self.config.top_padding, 0, self.config.bottom_padding)
-        self.adjustSize()
+        profile = self.profile
+        prev_geometry = self.frameGeometry()
+        self.set_content_offset(self.shake_offset)
 
-        text_bound = self.counter_text.boundingRect()
+        text_bound = self.counter_view.text_rect()
         self.text_width = text_bound.width()
         self.text_height = text_bound.height()
 
-        self.width = int(self.text_width + self.config.horz_margin * 2)
-        self.height = int(self.text_height + self.config.top_margin + self.config.bottom_margin)
+        self.width = int(self.text_width + profile.horz_margin * 2)
+        self.height = int(self.text_height + profile.top_margin + profile.bottom_margin)
 
-        prev_geometry = self.frameGeometry()
-        self.setFixedWidth(self.width)
-        self.text_view.setFixedSize(self.width, self.height)
-        self.text_scene.setSceneRect(0, 0, self.width, self.height)
-        self.cooldown_view.setFixedSize(self.width, self.config.bar_width)
-        self.cooldown_scene.setSceneRect(0, 0, self.width, self.config.bar_width)
+        self.setFixedWidth(self.width + profile.shake_padding * 2)
+        self.counter_view.set_canvas(self.width, self.height)
+        self.cooldown_view.setFixedSize(self.width, profile.bar_width)
+        self.cooldown_scene.setSceneRect(0, 0, self.width, profile.bar_width)
+        self.cooldown_view.fitInView(QRectF(0, 0, self.width, profile.bar_width))
+        # Only once the counter has its new size, or the window never shrinks
+        self.adjustSize()
 
-        if self.config.alignment == ComboAlignment.CENTER:
+        if profile.alignment == ComboAlignment.CENTER:
             self.move(self.pos() - self.frameGeometry().center() + prev_geometry.center())
-        elif self.config.alignment == ComboAlignment.RIGHT:
+        elif profile.alignment == ComboAlignment.RIGHT:
             self.move(self.pos() - self.frameGeometry().topRight() + prev_geometry.topRight())
-        elif self.config.alignment == ComboAlignment.LEFT:
+        elif profile.alignment == ComboAlignment.LEFT:
             self.move(self.pos() - self.frameGeometry().topLeft() + prev_geometry.topLeft())
         
         self.update()
 
     def animate_counter(self) -> None:
-        self.counter_animation: QVariantAnimation
-        if hasattr(self, "counter_animation") and self.counter_animation is not None:
-            self.counter_animation.stop()
-        
-        self.counter_animation = QVariantAnimation(self.text_view)
+        duration = self.effects.zoom_duration(
+            self.profile.counter_anim_duration, time.monotonic()
+        )
+        self.counter_animation.stop()
+        if duration == 0:
+            # Too fast to see a zoom, jump straight to the final size
+            self.counter_view.zoom(QRectF(0, 0, self.width, self.height))
+            if self.config.force_repaint:
+                self.request_repaint()
+
+            return
+
+        zoom_scale = self.profile.zoom_scale
         self.counter_animation.setStartValue(QRectF(
-            self.width * (1.0 - self.zoom_scale) * 0.5, 
-            self.height * (1.0 - self.zoom_scale), 
-            self.width * self.zoom_scale, 
-            self.height * self.zoom_scale
+            self.width * (1.0 - zoom_scale) * 0.5, 
+            self.height * (1.0 - zoom_scale), 
+            self.width * zoom_scale, 
+            self.height * zoom_scale
         ))
         self.counter_animation.setEndValue(QRectF(
             0, 0, self.width, self.height
         ))
-        
-        self.counter_animation.valueChanged.connect(
-            self.repaint_func(lambda x: self.text_view.fitInView(x, Qt.KeepAspectRatio))
-        )
-
-        self.counter_animation.setDuration(self.config.counter_anim_duration)
+        self.counter_animation.setDuration(duration)
         self.counter_animation.start()
 
     def animate_cooldown(self) -> None:
-        if self.counter == 0:
+        deadline = self.model.deadline
+        if deadline is None:
             return
 
-        self.cooldown_animation: QVariantAnimation
-        if hasattr(self, "cooldown_animation") and self.cooldown_animation is not None:
-            self.cooldown_animation.stop()
-        
-        self.cooldown_animation = QVariantAnimation(self.cooldown_view)
-        self.cooldown_view.fitInView(QRectF(0, 0, self.width, self.config.bar_width))
-        self.cooldown_animation.setStartValue(QRectF(
-            self.config.horz_margin, 0, self.text_width, self.config.bar_width
-        ))
-        self.cooldown_animation.setEndValue(QRectF(
-            self.width/2, 0, 0, self.config.bar_width
+        # The bar shrinks towards the center as the deadline approaches
+        remaining = min(1.0, max(0.0, (deadline - time.monotonic()) / self.model.cooldown))
+        profile = self.profile
+        self.cooldown_bar.setRect(QRectF(
+            profile.horz_margin + (self.width / 2 - profile.horz_margin) * (1.0 - remaining),
+            0,
+            self.text_width * remaining,
+            profile.bar_width
         ))
-        self.cooldown_animation.valueChanged.connect(
-            self.repaint_func(lambda x: self.cooldown_bar.setRect(x))
-        )
-        self.cooldown_animation.finished.connect(self.reset_counter)
-
-        self.cooldown_animation.setDuration(self.config.cooldown_duration)
-        self.cooldown_animation.start()
     
     def animate_shake(self) -> None:
         if not self.config.shake_enabled:
             return
 
-        shake_animation = QVariantAnimation(self)
-
-        animation_time = 0.0
-        shake_interval = 1.0 / self.config.shake_count
-        for count in range(self.config.shake_count):
-            shake_animation.setKeyValueAt(
-                animation_time, 
-                QPoint(
-                    self.pos().x() + random.randint(-1, 1) * self.config.shake_intensity,
-                    self.pos().y() + random.randint(-1, 1) * self.config.shake_intensity,
-                )
-            )
-            animation_time += shake_interval
-        
-        shake_animation.valueChanged.connect(
-            lambda x: self.move(x)
+        if self.shake_animation.state() == QAbstractAnimation.Running:
+            self.shake_animation.stop()
+            if not self.shake_in_window:
+                # Settle back to where the previous shake started, keeping any
+                # movement made by adjust_window in the meantime
+                self.move(self.pos() - self.shake_animation.currentValue() + self.shake_origin)
+
+        profile = self.profile
+        self.shake_in_window = profile.shake_in_window
+        if self.shake_in_window:
+            # Offsets are applied to the content, the window stays put
+            key_values = profile.shake_key_values
+        else:
+            self.shake_origin = QPoint(self.pos())
+            key_values = [
+                (animation_time, self.shake_origin + offset)
+                for animation_time, offset in profile.shake_key_values
+            ]
+
+        self.shake_animation.setKeyValues(key_values)
+        self.shake_animation.setDuration(profile.shake_duration)
+        self.shake_animation.start()
+
+    def on_shake_frame(self, value: QPoint) -> None:
+        if self.shake_in_window:
+            self.set_content_offset(value)
+        else:
+            self.move(value)
+
+    def set_content_offset(self, offset: QPoint) -> None:
+        profile = self.profile
+        padding = profile.shake_padding
+        self.shake_offset = offset
+        self.layout.setContentsMargins(
+            padding + offset.x(),
+            profile.top_padding + padding + offset.y(),
+            padding - offset.x(),
+            profile.bottom_padding + padding - offset.y()
         )
-        shake_animation.setEndValue(QPoint(self.pos()))
-        shake_animation.setDuration(self.config.shake_duration)
-        shake_animation.start()
 
     def repaint_rect(self) -> QRect:
         window_rect = self.rect()
@@ -430,16 +858,28 @@ class ComboTool(Tool):
         return window_rect
 
     def repaint_func(self, in_func: Callable[[Any], None]) -> Callable[[Any], None]:
-        if not self.config.force_repaint:
-            return in_func
-
+        # Checked per call since the animations outlive config reloads
         def func(x: Any) -> None:
             in_func(x)
-            self.repaint()
+            if self.config.force_repaint:
+                self.request_repaint()
 
         return func
 
+    def request_repaint(self) -> None:
+        if self.config.force_repaint_resize:
+            self.repaint()
+            return
+
+        # Invalidate the whole window at most once per frame tick
+        self.repaint_requested = True
+        if not self.timer.isActive():
+            self.timer.start()
+
     def repaint(self) -> None:
         self.repaint_offset = not self.repaint_offset
-        self.setFixedWidth(self.width + self.repaint_offset * self.config.force_repaint_px)
+        self.setFixedWidth(
+            self.width + self.profile.shake_padding * 2
+            + self.repaint_offset * self.config.force_repaint_px
+        )
         
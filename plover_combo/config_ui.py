@@ -1,14 +1,17 @@
+from typing import Any, Callable, List, Tuple
+
 from PyQt5.QtWidgets import (
-    QDialog, QWidget, QLabel, QSpinBox, 
+    QDialog, QWidget, QLabel, QSpinBox,
     QComboBox, QDialogButtonBox, QGridLayout,
-    QGroupBox, QCheckBox, QVBoxLayout,
+    QGroupBox, QCheckBox, QVBoxLayout, QHBoxLayout,
     QLineEdit, QScrollArea, QSizePolicy,
     QPlainTextEdit, QSizePolicy
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QRect, QTimer
+from PyQt5.QtGui import QResizeEvent, QShowEvent
 
 from plover_combo.combo_config import (
-    ComboAlignment, ComboConfig, CONFIG_NAMES, CONFIG_ORDER, 
+    ComboAlignment, ComboConfig, CONFIG_NAMES, CONFIG_ORDER,
     CONFIG_TYPES, CONFIG_RANGES, ALIGNMENT_OPTIONS
 )
 from plover_combo.combo_colors import COLOR_FORMAT
@@ -17,14 +20,51 @@ from plover_combo.combo_colors import COLOR_FORMAT
 FIELD_DATA_WIDTH = 250
 PLAIN_TEXT_DATA_HEIGHT = 200
 
+# Placeholder height per field of a group that hasn't been built yet
+FIELD_ROW_HEIGHT = 32
+# Groups within this many pixels below the viewport are built ahead
+BUILD_AHEAD = 200
+# Quiet time after the last edit before it is previewed
+PREVIEW_DELAY = 150
+
+
+def config_groups() -> List[Tuple[str, List[str]]]:
+    groups = []
+    for config_name in CONFIG_ORDER:
+        if config_name not in CONFIG_NAMES:
+            groups.append((config_name, []))
+        else:
+            groups[-1][1].append(config_name)
+
+    return groups
+
 
 class ConfigUI(QDialog):
+    """
+    Settings dialog editing temp_config. Groups are only built once they
+    are scrolled into view. With a preview callback, edits are collected
+    for PREVIEW_DELAY ms and then handed to it while the dialog is open.
+    """
 
-    def __init__(self, temp_config: ComboConfig, parent: QWidget = None) -> None:
+    def __init__(
+        self,
+        temp_config: ComboConfig,
+        parent: QWidget = None,
+        preview: Callable[[ComboConfig], None] = None
+    ) -> None:
         super().__init__(parent)
         self.temp_config = temp_config
+        self.preview = preview
+        self.changed_fields = set()
+        self.setup_preview_timer()
         self.setup_window()
 
+    def setup_preview_timer(self) -> None:
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY)
+        self.preview_timer.timeout.connect(self.apply_preview)
+
     def setup_window(self) -> None:
         self.scroll_widget = QWidget()
         self.scroll_area = QScrollArea()
@@ -32,88 +72,31 @@ class ConfigUI(QDialog):
         self.scroll_layout = QVBoxLayout()
         self.fields = dict()
 
-        current_grid_row = 0
-        current_grid_layout: QGridLayout = None
-        current_groupbox: QGroupBox = None
-
-        for config_name in CONFIG_ORDER:
-            if config_name not in CONFIG_NAMES:
-                if current_groupbox is not None:
-                    current_groupbox.setLayout(current_grid_layout)
-                    self.scroll_layout.addWidget(current_groupbox)
-                
-                current_grid_row = 0
-                current_groupbox = QGroupBox()
-                current_groupbox.setTitle(config_name)
-                current_grid_layout = QGridLayout()
-                continue
-            
-            field_label = QLabel()
-            field_label.setText(CONFIG_NAMES[config_name])
+        # (group box, builder) pairs for groups not built yet
+        self.pending_groups: List[Tuple[QGroupBox, Callable[[QGroupBox], None]]] = []
 
-            field_type = CONFIG_TYPES[config_name]
-            field_data = None
-
-            if field_type == bool:
-                field_data = QCheckBox()
-                field_data.setChecked(getattr(self.temp_config, config_name))
-
-            elif field_type == int:
-                low, high, step, suffix = CONFIG_RANGES[config_name]
-                field_data = QSpinBox()
-                field_data.setRange(low, high)
-                field_data.setSingleStep(step)
-                field_data.setSuffix(suffix)
-                field_data.setValue(getattr(self.temp_config, config_name))
-
-            elif field_type == str:
-                field_data = QLineEdit()
-                field_data.setText(getattr(self.temp_config, config_name))
-
-            elif field_type == ComboAlignment:
-                field_data = QComboBox()
-                field_data.addItems(ALIGNMENT_OPTIONS)
-                field_data.setCurrentIndex(
-                    getattr(self.temp_config, config_name).value
-                )
-
-            if field_data is not None:
-                field_data.setMinimumWidth(FIELD_DATA_WIDTH)
-                current_grid_layout.addWidget(
-                    field_label, current_grid_row, 0, 1, 1, Qt.AlignRight
-                )
-                current_grid_layout.addWidget(
-                    field_data, current_grid_row, 1, 1, 1, Qt.AlignLeft
-                )
-
-                self.fields[config_name] = field_data
-                current_grid_row += 1
-
-        if current_groupbox is not None:
-            current_groupbox.setLayout(current_grid_layout)
-            self.scroll_layout.addWidget(current_groupbox)
-
-        combo_color_group = QGroupBox()
-        combo_color_group.setTitle("Combo Colors")
-        combo_color_layout = QVBoxLayout()
-
-        combo_color_label = QLabel()
-        combo_color_label.setText(COLOR_FORMAT)
-        combo_color_layout.addWidget(combo_color_label)
+        for group_name, config_names in config_groups():
+            self.add_group(
+                group_name,
+                lambda groupbox, names=config_names: self.build_fields(groupbox, names),
+                len(config_names) * FIELD_ROW_HEIGHT
+            )
 
-        combo_color_data = QPlainTextEdit()
-        combo_color_data.setPlainText(self.temp_config.combo_colors)
-        combo_color_data.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.Fixed)
-        combo_color_data.setFixedHeight(PLAIN_TEXT_DATA_HEIGHT)
-        combo_color_layout.addWidget(combo_color_data)
-        self.fields["combo_colors"] = combo_color_data
+        self.add_group(
+            "Combo Colors",
+            self.build_combo_colors,
+            PLAIN_TEXT_DATA_HEIGHT + FIELD_ROW_HEIGHT * 2
+        )
 
-        combo_color_group.setLayout(combo_color_layout)
-        self.scroll_layout.addWidget(combo_color_group)
+        self.live_preview = QCheckBox()
+        self.live_preview.setText("Live Preview")
+        self.live_preview.setChecked(self.temp_config.live_preview)
+        self.live_preview.setEnabled(self.preview is not None)
+        self.live_preview.toggled.connect(self.on_live_preview_toggled)
 
         self.button_box = QDialogButtonBox(
             (
-                QDialogButtonBox.Cancel | 
+                QDialogButtonBox.Cancel |
                 QDialogButtonBox.Ok
             ),
             parent=self
@@ -123,29 +106,189 @@ class ConfigUI(QDialog):
 
         self.scroll_widget.setLayout(self.scroll_layout)
         self.scroll_area.setWidget(self.scroll_widget)
+        self.scroll_area.verticalScrollBar().valueChanged.connect(self.build_visible_groups)
+
+        self.button_layout = QHBoxLayout()
+        self.button_layout.addWidget(self.live_preview)
+        self.button_layout.addWidget(self.button_box)
 
         self.layout = QVBoxLayout()
         self.layout.addWidget(self.scroll_area)
-        self.layout.addWidget(self.button_box)
+        self.layout.addLayout(self.button_layout)
         self.setLayout(self.layout)
 
-    def save_settings(self) -> None:
-        for config_name in CONFIG_NAMES.keys():
-            field_type = CONFIG_TYPES[config_name]
-            field_data = self.fields[config_name]
-            field_value = None
-
-            if field_type == bool:
-                field_value = field_data.isChecked()
-            elif field_type == int:
-                field_value = field_data.value()
-            elif field_type == str:
-                field_value = field_data.text()
-            elif field_type == ComboAlignment:
-                field_value = ComboAlignment(field_data.currentIndex())
+    def add_group(
+        self,
+        group_name: str,
+        build: Callable[[QGroupBox], None],
+        placeholder_height: int
+    ) -> None:
+        groupbox = QGroupBox()
+        groupbox.setTitle(group_name)
+        groupbox.setMinimumHeight(placeholder_height)
+        self.scroll_layout.addWidget(groupbox)
+        self.pending_groups.append((groupbox, build))
+
+    def showEvent(self, event: QShowEvent) -> None:
+        super().showEvent(event)
+        # Wait for the first layout pass so group positions are known
+        QTimer.singleShot(0, self.build_visible_groups)
+
+    def resizeEvent(self, event: QResizeEvent) -> None:
+        super().resizeEvent(event)
+        # A taller dialog shows more groups without any scrolling
+        if self.pending_groups:
+            QTimer.singleShot(0, self.build_visible_groups)
+
+    def build_visible_groups(self) -> None:
+        # Make sure group positions reflect the groups built so far
+        self.scroll_layout.activate()
+        scroll_bar = self.scroll_area.verticalScrollBar()
+        if scroll_bar.maximum() == 0:
+            # Everything fits in the viewport, so every group is visible
+            for groupbox, build in self.pending_groups:
+                build(groupbox)
+                groupbox.setMinimumHeight(0)
 
+            self.pending_groups = []
+            return
+
+        viewport = self.scroll_area.viewport()
+        visible_rect = QRect(
+            0, scroll_bar.value(),
+            viewport.width(), viewport.height() + BUILD_AHEAD
+        )
+
+        pending_groups = []
+        built = False
+        for groupbox, build in self.pending_groups:
+            if groupbox.geometry().intersects(visible_rect):
+                build(groupbox)
+                groupbox.setMinimumHeight(0)
+                built = True
+            else:
+                pending_groups.append((groupbox, build))
+
+        self.pending_groups = pending_groups
+
+        # Built groups rarely match their placeholder height exactly
+        if built and pending_groups:
+            QTimer.singleShot(0, self.build_visible_groups)
+
+    def build_fields(self, groupbox: QGroupBox, config_names: List[str]) -> None:
+        grid_layout = QGridLayout()
+        for grid_row, config_name in enumerate(config_names):
+            field_label = QLabel()
+            field_label.setText(CONFIG_NAMES[config_name])
+
+            field_data = self.create_field(config_name)
+            if field_data is None:
+                continue
+
+            field_data.setMinimumWidth(FIELD_DATA_WIDTH)
+            grid_layout.addWidget(
+                field_label, grid_row, 0, 1, 1, Qt.AlignRight
+            )
+            grid_layout.addWidget(
+                field_data, grid_row, 1, 1, 1, Qt.AlignLeft
+            )
+            self.fields[config_name] = field_data
+
+        groupbox.setLayout(grid_layout)
+
+    def create_field(self, config_name: str) -> QWidget:
+        field_type = CONFIG_TYPES[config_name]
+        field_data = None
+        on_changed = lambda *_: self.on_field_changed(config_name)
+
+        if field_type == bool:
+            field_data = QCheckBox()
+            field_data.setChecked(getattr(self.temp_config, config_name))
+            field_data.toggled.connect(on_changed)
+
+        elif field_type == int:
+            low, high, step, suffix = CONFIG_RANGES[config_name]
+            field_data = QSpinBox()
+            field_data.setRange(low, high)
+            field_data.setSingleStep(step)
+            field_data.setSuffix(suffix)
+            field_data.setValue(getattr(self.temp_config, config_name))
+            field_data.valueChanged.connect(on_changed)
+
+        elif field_type == str:
+            field_data = QLineEdit()
+            field_data.setText(getattr(self.temp_config, config_name))
+            field_data.textChanged.connect(on_changed)
+
+        elif field_type == ComboAlignment:
+            field_data = QComboBox()
+            field_data.addItems(ALIGNMENT_OPTIONS)
+            field_data.setCurrentIndex(
+                getattr(self.temp_config, config_name).value
+            )
+            field_data.currentIndexChanged.connect(on_changed)
+
+        return field_data
+
+    def build_combo_colors(self, groupbox: QGroupBox) -> None:
+        combo_color_layout = QVBoxLayout()
+
+        combo_color_label = QLabel()
+        combo_color_label.setText(COLOR_FORMAT)
+        combo_color_layout.addWidget(combo_color_label)
+
+        combo_color_data = QPlainTextEdit()
+        combo_color_data.setPlainText(self.temp_config.combo_colors)
+        combo_color_data.setSizePolicy(QSizePolicy.MinimumExpanding, QSizePolicy.Fixed)
+        combo_color_data.setFixedHeight(PLAIN_TEXT_DATA_HEIGHT)
+        combo_color_data.textChanged.connect(lambda: self.on_field_changed("combo_colors"))
+        combo_color_layout.addWidget(combo_color_data)
+        self.fields["combo_colors"] = combo_color_data
+
+        groupbox.setLayout(combo_color_layout)
+
+    def field_value(self, config_name: str) -> Any:
+        field_type = CONFIG_TYPES[config_name]
+        field_data = self.fields[config_name]
+
+        if config_name == "combo_colors":
+            return field_data.toPlainText()
+        if field_type == bool:
+            return field_data.isChecked()
+        if field_type == int:
+            return field_data.value()
+        if field_type == str:
+            return field_data.text()
+        if field_type == ComboAlignment:
+            return ComboAlignment(field_data.currentIndex())
+
+        return None
+
+    def read_fields(self, config_names: set) -> None:
+        for config_name in config_names:
+            field_value = self.field_value(config_name)
             if field_value is not None:
                 setattr(self.temp_config, config_name, field_value)
-        
-        self.temp_config.combo_colors = self.fields["combo_colors"].toPlainText()
+
+    def on_field_changed(self, config_name: str) -> None:
+        self.changed_fields.add(config_name)
+        if self.preview is not None and self.live_preview.isChecked():
+            self.preview_timer.start()
+
+    def on_live_preview_toggled(self, checked: bool) -> None:
+        self.temp_config.live_preview = checked
+        if checked and self.changed_fields:
+            self.preview_timer.start()
+
+    def apply_preview(self) -> None:
+        # Only fields edited since the last preview are read back
+        self.read_fields(self.changed_fields)
+        self.changed_fields.clear()
+        self.preview(self.temp_config)
+
+    def save_settings(self) -> None:
+        self.preview_timer.stop()
+        # Groups never built still hold their values in temp_config
+        self.read_fields(self.changed_fields)
+        self.changed_fields.clear()
         self.accept()
@@ -0,0 +1,49 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+from PyQt5.QtCore import QCoreApplication, QSettings
+from PyQt5.QtWidgets import QApplication
+
+from tests.stub_engine import StubEngine
+
+
+@pytest.fixture(scope="session")
+def app(tmp_path_factory: pytest.TempPathFactory) -> QApplication:
+    # Keep tests away from the user's Plover settings
+    QSettings.setDefaultFormat(QSettings.IniFormat)
+    QSettings.setPath(
+        QSettings.IniFormat, QSettings.UserScope,
+        str(tmp_path_factory.mktemp("settings"))
+    )
+    QCoreApplication.setOrganizationName("plover_combo_tests")
+
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def make_tool(app: QApplication, tmp_path):
+    from plover_combo.combo_ui import ComboTool
+
+    tools = []
+
+    def make_tool(**overrides):
+        tool = ComboTool(StubEngine())
+        tool.session_log.directory = str(tmp_path)
+        previous = tool.config.copy()
+        for key, value in overrides.items():
+            setattr(tool.config, key, value)
+
+        tool.reload_config(previous)
+        tools.append(tool)
+        return tool
+
+    yield make_tool
+
+    for tool in tools:
+        tool.end_session()
+        tool.deleteLater()
+
+    app.processEvents()
@@ -0,0 +1,23 @@
+from typing import Callable, Dict, List, NamedTuple
+
+
+class StubStroke(NamedTuple):
+    is_correction: bool
+
+
+class StubEngine:
+    """
+    Just enough of StenoEngine for ComboTool: hooks are recorded, and
+    stroke() calls the "stroked" ones the way Plover's engine would.
+    """
+
+    def __init__(self) -> None:
+        self.hooks: Dict[str, List[Callable]] = dict()
+
+    def signal_connect(self, name: str, callback: Callable) -> None:
+        self.hooks.setdefault(name, []).append(callback)
+
+    def stroke(self, is_correction: bool = False) -> None:
+        stroke = StubStroke(is_correction)
+        for callback in self.hooks.get("stroked", []):
+            callback(stroke)
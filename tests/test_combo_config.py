@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from plover_combo.combo_config import (
+    CONFIG_ITEMS, CONFIG_RANGES, CONFIG_VERSION, ComboAlignment,
+    ComboConfig, dump_config, load_config, validate_value
+)
+
+
+@pytest.mark.parametrize("key", sorted(CONFIG_RANGES))
+def test_ranged_keys_clamp_on_construction_and_load(key):
+    low, high = CONFIG_RANGES[key][:2]
+    for value, expected in ((low - 1000, low), (high + 1000, high), (low, low), (high, high)):
+        config = ComboConfig({key: value})
+        assert getattr(config, key) == expected
+        assert getattr(load_config(dump_config(config)), key) == expected
+
+
+@pytest.mark.parametrize("key, value", [
+    ("bar_width", True),
+    ("bar_width", 12.0),
+    ("bar_width", "12"),
+    ("title_text", 5),
+    ("session_log", 1),
+    ("alignment", "center"),
+])
+def test_wrong_types_are_rejected(key, value):
+    with pytest.raises(TypeError):
+        validate_value(key, value)
+
+    with pytest.raises(TypeError):
+        ComboConfig({key: value})
+
+    # Loading skips the value and keeps the default instead
+    blob = json.dumps({"version": CONFIG_VERSION, "values": {key: value}})
+    assert getattr(load_config(blob), key) == CONFIG_ITEMS[key]
+
+
+def test_alignment_is_read_from_its_index():
+    assert ComboConfig({"alignment": 2}).alignment == ComboAlignment.RIGHT
+    with pytest.raises(ValueError):
+        ComboConfig({"alignment": 7})
+
+
+def test_copy_is_equal_and_independent():
+    config = ComboConfig({"bar_width": 20})
+    copy = config.copy()
+    assert copy == config
+    assert copy is not config
+
+    copy.bar_width = 21
+    assert config.bar_width == 20
+    assert copy != config
+    assert config != object()
+
+
+def test_config_is_unhashable():
+    with pytest.raises(TypeError):
+        hash(ComboConfig())
+
+
+def test_diff_lists_changed_keys():
+    config = ComboConfig()
+    assert config.diff(config.copy()) == set()
+
+    other = config.copy()
+    other.bar_width += 1
+    other.title_text = "Go"
+    assert config.diff(other) == {"bar_width", "title_text"}
+    assert other.diff(config) == {"bar_width", "title_text"}
+
+
+@pytest.mark.parametrize("version", [CONFIG_VERSION - 1, -1, CONFIG_VERSION + 1])
+def test_load_config_rejects_versions_it_cannot_read(version):
+    blob = json.dumps({"version": version, "values": {"bar_width": 20}})
+    with pytest.raises(ValueError):
+        load_config(blob)
+
+
+@pytest.mark.parametrize("blob", ["", "not json", "[]", "{}", '{"version": "1", "values": {}}', None])
+def test_load_config_rejects_unreadable_blobs(blob):
+    with pytest.raises(ValueError):
+        load_config(blob)
+
+
+def test_dump_and_load_round_trip():
+    config = ComboConfig({"bar_width": 20, "title_text": "Go", "highscore": 99})
+    loaded = load_config(dump_config(config))
+    assert loaded.bar_width == 20
+    assert loaded.title_text == "Go"
+    # Runtime state is kept out of the blob
+    assert loaded.highscore == 0
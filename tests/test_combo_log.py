@@ -0,0 +1,63 @@
+import time
+
+from datetime import date, datetime
+
+import pytest
+
+from plover_combo.combo_log import SessionLog, SessionQuery
+from plover_combo.combo_model import ComboRecord, EndReason
+
+
+@pytest.fixture
+def local_timezone(monkeypatch):
+    def set_timezone(name: str) -> None:
+        monkeypatch.setenv("TZ", name)
+        time.tzset()
+
+    yield set_timezone
+    monkeypatch.undo()
+    time.tzset()
+
+
+@pytest.mark.parametrize("timezone", ["UTC", "Asia/Kolkata", "Asia/Kathmandu", "America/St_Johns"])
+def test_best_per_day_splits_at_local_midnight(tmp_path, local_timezone, timezone):
+    local_timezone(timezone)
+    log = SessionLog(str(tmp_path))
+    for when, length in (
+        (datetime(2026, 10, 17, 23, 50), 5),
+        (datetime(2026, 10, 18, 0, 10), 7),
+        (datetime(2026, 10, 18, 23, 59), 3),
+        (datetime(2026, 10, 19, 0, 0), 2),
+    ):
+        log.append(ComboRecord(when.timestamp(), length, 0, EndReason.COOLDOWN))
+
+    log.flush()
+    assert SessionQuery(log).best_per_day() == {
+        date(2026, 10, 17): 5,
+        date(2026, 10, 18): 7,
+        date(2026, 10, 19): 2,
+    }
+
+
+def make_record(start: float, length: int) -> ComboRecord:
+    return ComboRecord(start, length, 0, EndReason.COOLDOWN)
+
+
+def test_failed_flush_keeps_records_for_the_next_one(tmp_path):
+    # A file where the log directory should be makes every write fail
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    log = SessionLog(str(blocker / "log"))
+    log.append(make_record(1.0, 1))
+    log.append(make_record(2.0, 2))
+
+    with pytest.raises(OSError):
+        log.flush()
+
+    log.append(make_record(3.0, 3))
+    log.directory = str(tmp_path / "log")
+    log.flush()
+    assert [record.length for record in log.records()] == [1, 2, 3]
+
+    log.flush()
+    assert [record.length for record in log.records()] == [1, 2, 3]
@@ -0,0 +1,222 @@
+import time
+
+import pytest
+
+from PyQt5.QtCore import QAbstractAnimation, QEvent, QObject
+
+
+# Seconds an idle tool is watched for timer and paint events
+IDLE_WINDOW = 2.0
+
+
+def process_for(app, seconds: float) -> None:
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        app.processEvents()
+        time.sleep(0.001)
+
+
+@pytest.mark.parametrize("coalesce_frames", [False, True])
+def test_reset_and_increment_in_one_drain_still_expire(app, make_tool, coalesce_frames):
+    tool = make_tool(cooldown_duration=300, coalesce_frames=coalesce_frames)
+
+    # Stroke, undo and stroke again, all handed over before the drain runs
+    timestamp = time.monotonic()
+    tool.stroke_queue.extend([(timestamp, False), (timestamp, True), (timestamp, False)])
+    tool.drain_strokes()
+    assert tool.model.counter == 1
+    assert tool.model.deadline is not None
+
+    process_for(app, 1.5)
+    assert tool.model.counter == 0
+    assert tool.model.deadline is None
+    assert not tool.cooldown_timer.isActive()
+    assert not tool.timer.isActive()
+    assert tool.counter_animation.state() == QAbstractAnimation.Stopped
+    assert tool.idle
+
+
+def test_unreadable_settings_blob_falls_back_to_defaults(app, make_tool):
+    from PyQt5.QtCore import QSettings
+
+    from plover_combo.combo_config import CONFIG_KEY, ComboConfig
+    from plover_combo.combo_ui import ComboTool
+
+    settings = QSettings()
+    settings.beginGroup(ComboTool.ROLE)
+    settings.setValue(CONFIG_KEY, '{"version": 0, "values": {"bar_width": 20}}')
+    settings.endGroup()
+    try:
+        tool = make_tool()
+    finally:
+        settings.remove(ComboTool.ROLE)
+
+    assert tool.config.bar_width == ComboConfig().bar_width
+
+
+class ToolEventCounter(QObject):
+    def __init__(self, tool) -> None:
+        super().__init__()
+        self.tool = tool
+        self.events = []
+
+    def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+        if event.type() in (QEvent.Timer, QEvent.Paint, QEvent.UpdateRequest):
+            owner = watched
+            while owner is not None and owner is not self.tool:
+                owner = owner.parent()
+
+            if owner is not None:
+                self.events.append((type(watched).__name__, int(event.type())))
+
+        return False
+
+
+def test_idle_tool_runs_no_timers_or_repaints(app, make_tool):
+    tool = make_tool(cooldown_duration=300, shake_on_all=True)
+    timestamp = time.monotonic()
+    tool.stroke_queue.extend([(timestamp, False)] * 5)
+    tool.drain_strokes()
+    process_for(app, 1.0)
+
+    assert tool.idle
+    assert tool.model.counter == 0
+    assert not tool.timer.isActive()
+    assert not tool.cooldown_timer.isActive()
+    assert tool.counter_animation.state() == QAbstractAnimation.Stopped
+    assert tool.shake_animation.state() == QAbstractAnimation.Stopped
+
+    event_counter = ToolEventCounter(tool)
+    app.installEventFilter(event_counter)
+    try:
+        process_for(app, IDLE_WINDOW)
+    finally:
+        app.removeEventFilter(event_counter)
+
+    assert event_counter.events == []
+    assert tool.idle
+
+    tool.stroke_queue.append((time.monotonic(), False))
+    tool.drain_strokes()
+    assert not tool.idle
+    assert tool.timer.isActive()
+    assert tool.cooldown_timer.isActive()
+    assert tool.counter_animation.state() == QAbstractAnimation.Running
+
+
+def fresh_tool(make_tool, **values):
+    # Built from saved settings, so nothing goes through a live reload
+    from PyQt5.QtCore import QSettings
+
+    from plover_combo.combo_config import CONFIG_KEY, ComboConfig, dump_config
+    from plover_combo.combo_ui import ComboTool
+
+    settings = QSettings()
+    settings.beginGroup(ComboTool.ROLE)
+    settings.setValue(CONFIG_KEY, dump_config(ComboConfig(values)))
+    settings.endGroup()
+    try:
+        return make_tool()
+    finally:
+        settings.remove(ComboTool.ROLE)
+
+
+def live_tool(app, make_tool, steps):
+    tool = make_tool()
+    for values in steps:
+        config = tool.config.copy()
+        for key, value in values.items():
+            setattr(config, key, value)
+
+        tool.apply_config(config)
+        app.processEvents()
+
+    return tool
+
+
+@pytest.mark.parametrize("steps", [
+    [{"counter_font_size": 30}],
+    [{"counter_font_size": 100}, {"counter_font_size": 30}],
+    [{"top_margin": 0, "bottom_margin": 0}],
+    [{"horz_margin": 5}],
+    [{"bar_width": 2}],
+    [{"title_font_size": 40}, {"title_font_size": 10}],
+    [{"painted_counter": True, "counter_font_size": 40}],
+    [{"shake_in_window": True}, {"shake_in_window": False}],
+])
+def test_live_reload_matches_a_fresh_tool(app, make_tool, steps):
+    tool = live_tool(app, make_tool, steps)
+    final = dict()
+    for values in steps:
+        final.update(values)
+
+    fresh = fresh_tool(make_tool, **final)
+    app.processEvents()
+
+    assert tool.size() == fresh.size()
+    assert tool.counter_view.size() == fresh.counter_view.size()
+    assert tool.cooldown_view.size() == fresh.cooldown_view.size()
+
+
+def test_reopening_keeps_the_window_in_place(app, make_tool):
+    from PyQt5.QtCore import QSettings
+
+    from plover_combo.combo_ui import ComboTool
+
+    tool = make_tool()
+    tool.move(300, 300)
+    app.processEvents()
+    try:
+        for _ in range(3):
+            tool.save_state()
+            geometry = tool.geometry()
+            tool = make_tool()
+            app.processEvents()
+            assert tool.geometry() == geometry
+    finally:
+        QSettings().remove(ComboTool.ROLE)
+
+
+def test_reset_highscore_on_reload_updates_the_label(app, make_tool):
+    tool = make_tool()
+    timestamp = time.monotonic()
+    tool.stroke_queue.extend([(timestamp, False)] * 7)
+    tool.drain_strokes()
+    tool.render_frame()
+    assert tool.highscore_header.text() == "HI 7"
+
+    config = tool.config.copy()
+    config.reset_highscore = True
+    tool.apply_config(config)
+
+    assert tool.model.highscore == 0
+    assert tool.config.highscore == 0
+    assert tool.highscore_header.text() == "HI 0"
+
+
+def test_failed_log_write_is_retried_with_the_same_state(app, make_tool, tmp_path):
+    from PyQt5.QtCore import QSettings
+
+    from plover_combo.combo_model import ComboRecord, EndReason
+
+    tool = make_tool()
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    tool.session_log.directory = str(blocker / "log")
+    record = ComboRecord(1.0, 5, 0, EndReason.COOLDOWN)
+    tool.session_log.append(record)
+
+    state = {"session_log": True, "highscore": 5}
+    try:
+        with pytest.raises(OSError):
+            tool.write_state(state)
+
+        # StateWriter queues this same dict again for its next attempt
+        assert state == {"session_log": True, "highscore": 5}
+
+        tool.session_log.directory = str(tmp_path / "log")
+        tool.write_state(state)
+    finally:
+        QSettings().remove(tool.ROLE)
+
+    assert list(tool.session_log.records()) == [record]
@@ -0,0 +1,36 @@
+import time
+
+from plover_combo.combo_config import CONFIG_NAMES, ComboConfig
+from plover_combo.config_ui import ConfigUI
+
+
+def settle(app) -> None:
+    # Group building is deferred to zero-length timers
+    for _ in range(20):
+        app.processEvents()
+        time.sleep(0.002)
+
+
+def test_only_visible_groups_are_built(app):
+    dialog = ConfigUI(ComboConfig())
+    dialog.resize(400, 300)
+    dialog.show()
+    settle(app)
+
+    assert dialog.pending_groups
+    assert dialog.scroll_area.verticalScrollBar().maximum() > 0
+    dialog.close()
+
+
+def test_enlarging_the_dialog_builds_the_remaining_groups(app):
+    dialog = ConfigUI(ComboConfig())
+    dialog.resize(400, 300)
+    dialog.show()
+    settle(app)
+
+    dialog.resize(400, 3000)
+    settle(app)
+
+    assert dialog.pending_groups == []
+    assert set(CONFIG_NAMES) | {"combo_colors"} == set(dialog.fields)
+    dialog.close()
@@ -0,0 +1,43 @@
+import os
+import resource
+import time
+
+from PyQt5.QtCore import QObject
+
+
+STROKES = 1000000
+STROKES_PER_DRAIN = 100
+UNDO_EVERY = 997
+# Allowed RSS growth after warm-up, in KB
+RSS_SLACK_KB = 16 * 1024
+
+
+def current_rss_kb() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def test_million_strokes_keep_objects_and_memory_flat(app, make_tool):
+    tool = make_tool(shake_on_all=True, session_log=False)
+
+    def replay(first: int, last: int) -> None:
+        for batch in range(first, last, STROKES_PER_DRAIN):
+            timestamp = time.monotonic()
+            for index in range(batch, batch + STROKES_PER_DRAIN):
+                tool.stroke_queue.append((timestamp, index % UNDO_EVERY == 0))
+
+            tool.drain_strokes()
+            app.processEvents()
+
+    warm_up = STROKES // 10
+    replay(0, warm_up)
+    children = len(tool.findChildren(QObject))
+    rss = current_rss_kb()
+
+    replay(warm_up, STROKES)
+    assert tool.frame_stats.strokes > 0
+    assert len(tool.findChildren(QObject)) == children
+    assert current_rss_kb() - rss < RSS_SLACK_KB
@@ -0,0 +1,41 @@
+import json
+import os
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter, with PyQt5 and Plover already imported as
+# they are when Plover loads plugins
+IMPORT_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+import PyQt5.QtWidgets, plover.gui_qt.tool, plover.gui_qt.utils
+from PyQt5.QtCore import QFile
+start = time.perf_counter()
+import plover_combo.combo_ui
+elapsed = time.perf_counter() - start
+from plover_combo.combo_resources import load_font
+print(json.dumps({{
+    "elapsed": elapsed,
+    "icon": QFile(plover_combo.combo_ui.ComboTool.ICON).exists(),
+    "font_loads": load_font.cache_info().misses,
+}}))
+"""
+
+# Generous enough for a loaded machine; the import takes ~0.1s here
+IMPORT_BUDGET = 2.0
+
+
+def test_import_registers_resources_without_loading_the_font():
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SCRIPT.format(root=ROOT)], env=env
+    )
+    result = json.loads(output.splitlines()[-1])
+
+    # Plover builds its tool menu from ComboTool.ICON right after the import
+    assert result["icon"]
+    assert result["font_loads"] == 0
+    assert result["elapsed"] < IMPORT_BUDGET